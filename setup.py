@@ -49,10 +49,13 @@ setuptools.setup(
     include_package_data=True,
     install_requires=['dash>=2.0.0',
                       'visdcc>=0.0.40',
+                      'numpy>=1.22.0',
                       'pandas>=1.3.5',
                       'dash_core_components>=2.0.0',
                       'dash_html_components>=2.0.0',
                       'dash_bootstrap_components>=0.11.1',
                       'dash_daq>=0.5.0',
-                      'ontor>=0.3.0'],
+                      'ontor>=0.3.0',
+                      'rdflib>=5.0.0'],
+    extras_require={'production': ['waitress>=2.0.0', 'orjson>=3.6.0']},
 )
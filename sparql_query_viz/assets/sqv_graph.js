@@ -0,0 +1,116 @@
+/*
+Clientside callbacks of SPARQL-Query-Viz
+*/
+
+// number of lines of the sparql result shown on one page
+const RESULT_PAGE_LENGTH = 50;
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    sqv: {
+        /**
+         * merges the changes sent by the server into the graph data in format of visdcc
+         *
+         * the delta can replace the 'nodes' and 'edges' completely, 'nodes_patch' and 'edges_patch' only hold the
+         * ids and the changed attributes of the nodes and edges as columns, e.g. {id: [...], color: [...]}
+         */
+        apply_graph_delta: function (delta, graph_data) {
+            if (!delta) {
+                return window.dash_clientside.no_update;
+            }
+            const merged = {nodes: graph_data.nodes, edges: graph_data.edges};
+            ['nodes', 'edges'].forEach(function (element) {
+                if (delta[element]) {
+                    merged[element] = delta[element];
+                }
+                const patch = delta[element + '_patch'];
+                if (patch) {
+                    const positions = {};
+                    patch.id.forEach(function (id, position) {
+                        positions[id] = position;
+                    });
+                    const keys = Object.keys(patch).filter(function (key) {
+                        return key !== 'id';
+                    });
+                    merged[element] = merged[element].map(function (item) {
+                        if (!(item.id in positions)) {
+                            return item;
+                        }
+                        const changed = Object.assign({}, item);
+                        keys.forEach(function (key) {
+                            changed[key] = patch[key][positions[item.id]];
+                        });
+                        return changed;
+                    });
+                }
+            });
+            return merged;
+        },
+
+        /**
+         * only shows the nodes which match the search text, or which are connected by an edge matching it
+         */
+        search_graph: function (search_text, graph_data) {
+            if (typeof search_text !== 'string') {
+                return window.dash_clientside.no_update;
+            }
+            const text = search_text.toLowerCase();
+            const endpoints = new Set();
+            graph_data.edges.forEach(function (edge) {
+                if (edge.label.toLowerCase().includes(text)) {
+                    endpoints.add(edge.from.toLowerCase());
+                    endpoints.add(edge.to.toLowerCase());
+                }
+            });
+            const nodes = graph_data.nodes.map(function (node) {
+                const label = node.label.toLowerCase();
+                return Object.assign({}, node, {hidden: !(label.includes(text) || endpoints.has(label))});
+            });
+            return {nodes: nodes, edges: graph_data.edges};
+        },
+
+        /**
+         * updates the graph data either by the search text or by the changes sent by the server, depending on which
+         * input triggered the callback, nodes replaced by the server are searched again so they keep being hidden
+         */
+        update_graph: function (delta, search_text, graph_data) {
+            const triggered = window.dash_clientside.callback_context.triggered.map(function (trigger) {
+                return trigger.prop_id;
+            });
+            if (triggered.includes('search_graph.value')) {
+                return window.dash_clientside.sqv.search_graph(search_text, graph_data);
+            }
+            const merged = window.dash_clientside.sqv.apply_graph_delta(delta, graph_data);
+            if (merged !== window.dash_clientside.no_update && delta.nodes && search_text) {
+                return window.dash_clientside.sqv.search_graph(search_text, merged);
+            }
+            return merged;
+        },
+
+        /**
+         * gets the lines of the sparql result on the given page, a new result is always shown from its first page
+         */
+        show_sparql_query_result: function (sparql_query_result, page) {
+            const lines = (sparql_query_result || '').replace(/\n$/, '').split('\n');
+            const number_of_pages = Math.max(1, Math.ceil(lines.length / RESULT_PAGE_LENGTH));
+            const triggered = window.dash_clientside.callback_context.triggered.map(function (trigger) {
+                return trigger.prop_id;
+            });
+            if (triggered.includes('sparql-result-store.data') || !page) {
+                page = 1;
+            }
+            page = Math.min(Math.max(page, 1), number_of_pages);
+            const shown_lines = lines.slice((page - 1) * RESULT_PAGE_LENGTH, page * RESULT_PAGE_LENGTH);
+            return [shown_lines.join('\n'), page, number_of_pages, 'of ' + number_of_pages];
+        },
+
+        /**
+         * gets the last sparql queries of the history to be shown, each query of the history is one numbered line
+         */
+        show_sparql_query_history: function (sparql_query_history, number_of_shown_queries) {
+            if (!sparql_query_history) {
+                return '';
+            }
+            return sparql_query_history.slice(-number_of_shown_queries).join('');
+        }
+    }
+});
@@ -50,6 +50,8 @@ def parse_dataframe(edge_df: pandas.DataFrame, node_df: pandas.DataFrame = None)
 
     # Data post processing - convert the from and to columns in edge data as string for searching
     edge_df.loc[:, ['from', 'to']] = edge_df.loc[:, ['from', 'to']].astype(str)
+    # Data post processing - drop duplicated edges, they would be drawn on top of each other
+    edge_df = edge_df.drop_duplicates(subset=['from', 'to', 'label'] if 'label' in edge_df.columns else ['from', 'to'])
 
     # Data post processing (scaling numerical cols in nodes and edge)
     scaling_vars = {'node': None, 'edge': None}
@@ -66,13 +68,10 @@ def parse_dataframe(edge_df: pandas.DataFrame, node_df: pandas.DataFrame = None)
         # convert the node id column to string
         node_df.loc[:, 'id'] = node_df.loc[:, 'id'].astype(str)
         node_df.loc[:, 'title'] = node_df.loc[:, 'title'].astype(str)
-        # create the node data
-        for node in node_df.to_dict(orient='records'):
-            nodes.append({**node, **{'label': node['id'], 'title': node['title'], 'size': 7}})
+        # create the node data, the additional columns are added to the whole dataframe at once
+        nodes = node_df.assign(label=node_df['id'], size=7).to_dict(orient='records')
 
-    # create edges from df
-    edges = []
-    for row in edge_df.to_dict(orient='records'):
-        edges.append({**row, **{'id': row['id'], 'color': {'color': '#97C2FC'}}})
+    # create edges from df, every edge gets its own color dict
+    edges = edge_df.assign(color=[{'color': '#97C2FC'} for _ in range(len(edge_df))]).to_dict(orient='records')
     # return
     return {'nodes': nodes, 'edges': edges}, scaling_vars
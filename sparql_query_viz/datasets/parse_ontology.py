@@ -9,7 +9,6 @@ Data details:
 
 # imports
 import logging
-import os
 import ontor as ontor
 import pandas as pd
 from ontor import OntoEditor
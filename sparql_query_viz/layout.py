@@ -22,8 +22,11 @@ DEFAULT_EDGE_SIZE = 1
 # default node and edge color
 DEFAULT_COLOR = '#97C2FC'
 
+# default number of layers of the neighbourhood shown around the result of a sparql query
+DEFAULT_RESULT_LEVEL = 1
+
 # Taken from https://stackoverflow.com/questions/470690/how-to-automatically-generate-n-distinct-colors
-KELLY_COLORS_HEX = [
+KELLY_COLORS_HEX = (
     "#FFB300",  # Vivid Yellow
     "#A6BDD7",  # Very Light Blue
     "#803E75",  # Strong Purple
@@ -46,7 +49,17 @@ KELLY_COLORS_HEX = [
     "#593315",  # Deep Yellowish Brown
     "#F13A13",  # Vivid Reddish Orange
     "#232C16",  # Dark Olive Green
-]
+)
+
+# supported numerical cols and the numerical cols that are not offered as features, as they hold the size itself
+NUMERICAL_DTYPES = ('int16', 'int32', 'int64', 'float16', 'float32', 'float64')
+NUMERICAL_BLACKLIST_FEATURES = frozenset({'size', 'width'})
+
+# style of the rows of the layout and of the section headers, with the buttons of the header on the right, create_row
+# gives every row its own copy
+FLEX_ROW_STYLE = {'display': 'flex', 'flex-direction': 'row', 'justify-content': 'center', 'align-items': 'center'}
+FLEX_ROW_STYLE_SPACE_BETWEEN = {**FLEX_ROW_STYLE, 'margin-left': 0, 'margin-right': 0,
+                                'justify-content': 'space-between'}
 
 DEFAULT_OPTIONS = {
     'height': '800px',
@@ -54,6 +67,54 @@ DEFAULT_OPTIONS = {
     'interaction': {'hover': True},
 }
 
+# options of the dropdowns to compose sparql queries, they are only sent to the browser when the SPARQL Query section
+# is opened for the first time
+SPARQL_KEYWORD_OPTIONS = [
+    {'label': 'Prefix', 'value': 'PREFIX'},
+    {'label': 'Count as', 'value': 'COUNT ( ?[...] ) AS'},
+    {'label': 'Ask', 'value': 'ASK'},
+    {'label': 'Describe', 'value': 'DESCRIBE'},
+    {'label': 'Select', 'value': 'SELECT'},
+    {'label': 'Where', 'value': 'WHERE'},
+    {'label': 'Order', 'value': 'ORDER BY'},
+    {'label': 'Group', 'value': 'GROUP BY'},
+    {'label': 'Limit', 'value': 'LIMIT'},
+    {'label': 'Union', 'value': 'UNION'},
+    {'label': 'Filter', 'value': 'FILTER'},
+    {'label': 'Bind', 'value': 'BIND'},
+    {'label': 'Distinct', 'value': 'DISTINCT'},
+    {'label': 'Having', 'value': 'HAVING'},
+    {'label': 'Filter Exists', 'value': 'FILTER EXISTS'},
+    {'label': 'Filter not Exists', 'value': 'FILTER NOT EXISTS'},
+    {'label': 'Values', 'value': 'VALUES'}
+]
+
+SPARQL_VARIABLE_OPTIONS = [
+    {'label': 'X', 'value': '?x'},
+    {'label': 'Y', 'value': '?y'},
+    {'label': 'Z', 'value': '?z'}
+]
+
+SPARQL_SYNTAX_OPTIONS = [
+    {'label': '{', 'value': '{'},
+    {'label': '}', 'value': '}'},
+    {'label': '(', 'value': '('},
+    {'label': ')', 'value': ')'},
+    {'label': '.', 'value': '.'},
+    {'label': 'rdf', 'value': 'rdf:'},
+    {'label': 'rdfs', 'value': 'rdfs:'},
+    {'label': 'owl', 'value': 'owl:'},
+    {'label': 'owlready', 'value': 'owlready:'},
+    {'label': 'xsd', 'value': 'xsd:'},
+    {'label': 'obo', 'value': 'obo:'},
+    {'label': 'type', 'value': 'rdf:type'},
+    {'label': 'subClassOf', 'value': 'rdfs:subClassOf'},
+    {'label': 'label', 'value': 'rdfs:label'},
+    {'label': 'min', 'value': 'min'},
+    {'label': 'max', 'value': 'max'},
+    {'label': 'descended', 'value': 'desc'},
+]
+
 
 def get_options(directed: bool, opts_args: dict = None, physics: bool = True):
     """ defines the default options for the visdcc-graph and adds the optional arguments if not None
@@ -101,13 +162,13 @@ def get_distinct_colors(n: int, for_nodes=True):
      :type n: int
      :param for_nodes: indicates whether nodes or edges will be colored
      :type for_nodes: bool
-     :return: list of colors
-     :rtype: list[str]
+     :return: colors, at most as many as there are in the palette, the remaining values are not colored
+     :rtype: tuple[str]
     """
-    if for_nodes:
-        return KELLY_COLORS_HEX[:n]
-    else:
-        return KELLY_COLORS_HEX[2:(n + 2)]
+    # the colors for the edges start at the third color of the palette
+    offset = 0 if for_nodes else 2
+    n = min(n, len(KELLY_COLORS_HEX) - offset)
+    return KELLY_COLORS_HEX[offset:offset + n]
 
 
 def create_color_legend(text: str, color: str):
@@ -136,13 +197,9 @@ def create_info_text(text: str):
     ])
 
 
-def fetch_flex_row_style():
-    return {'display': 'flex', 'flex-direction': 'row', 'justify-content': 'center', 'align-items': 'center'}
-
-
 def create_row(children, style=None):
-    if style is None:
-        style = fetch_flex_row_style()
+    # every row gets its own copy of the style, the style constants are shared by many rows
+    style = dict(FLEX_ROW_STYLE if style is None else style)
     return dbc.Row(children,
                    style=style,
                    className="column flex-display")
@@ -150,9 +207,10 @@ def create_row(children, style=None):
 
 # forms for layout
 search_form = dbc.FormGroup([
-    dbc.Input(type="search", id="search_graph", placeholder="Search node or edge in graph..."),
+    # the graph is only searched after enter is pressed or the input loses focus, not on every keystroke
+    dbc.Input(type="search", id="search_graph", placeholder="Search node or edge in graph...", debounce=True),
     dbc.FormText(
-        "Show the node or edge you are looking for",
+        "Show the node or edge you are looking for (press Enter to search)",
         color="secondary",
     )
 ])
@@ -177,70 +235,28 @@ filter_node_form = dbc.FormGroup([
         dbc.Button("Add", id="add_to_query_button", outline=True, color="secondary", size="sm"),
         daq.BooleanSwitch(id='add_node_edge_to_query_button', on=False, color="#FFB300",
                           label="Select Edge/Node", labelPosition="top"),
-    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-        'justify-content': 'space-between'}),
+    ], FLEX_ROW_STYLE_SPACE_BETWEEN),
     dbc.Textarea(id="filter_nodes", placeholder="Enter SPARQL-query here..."),
     create_row([
         dcc.Dropdown(
             id='sparql-keywords-dropdown',
-            options=[
-                {'label': 'Prefix', 'value': 'PREFIX'},
-                {'label': 'Count as', 'value': 'COUNT ( ?[...] ) AS'},
-                {'label': 'Ask', 'value': 'ASK'},
-                {'label': 'Describe', 'value': 'DESCRIBE'},
-                {'label': 'Select', 'value': 'SELECT'},
-                {'label': 'Where', 'value': 'WHERE'},
-                {'label': 'Order', 'value': 'ORDER BY'},
-                {'label': 'Group', 'value': 'GROUP BY'},
-                {'label': 'Limit', 'value': 'LIMIT'},
-                {'label': 'Union', 'value': 'UNION'},
-                {'label': 'Filter', 'value': 'FILTER'},
-                {'label': 'Bind', 'value': 'BIND'},
-                {'label': 'Distinct', 'value': 'DISTINCT'},
-                {'label': 'Having', 'value': 'HAVING'},
-                {'label': 'Filter Exists', 'value': 'FILTER EXISTS'},
-                {'label': 'Filter not Exists', 'value': 'FILTER NOT EXISTS'},
-                {'label': 'Values', 'value': 'VALUES'}
-            ],
+            options=[],
             placeholder="Keywords",
             style={'width': '102px'},
         ),
         dcc.Dropdown(
             id='sparql-variables-dropdown',
-            options=[
-                {'label': 'X', 'value': '?x'},
-                {'label': 'Y', 'value': '?y'},
-                {'label': 'Z', 'value': '?z'}
-            ],
+            options=[],
             placeholder="Variables",
             style={'width': '97px'},
         ),
         dcc.Dropdown(
             id='sparql-syntax-dropdown',
-            options=[
-                {'label': '{', 'value': '{'},
-                {'label': '}', 'value': '}'},
-                {'label': '(', 'value': '('},
-                {'label': ')', 'value': ')'},
-                {'label': '.', 'value': '.'},
-                {'label': 'rdf', 'value': 'rdf:'},
-                {'label': 'rdfs', 'value': 'rdfs:'},
-                {'label': 'owl', 'value': 'owl:'},
-                {'label': 'owlready', 'value': 'owlready:'},
-                {'label': 'xsd', 'value': 'xsd:'},
-                {'label': 'obo', 'value': 'obo:'},
-                {'label': 'type', 'value': 'rdf:type'},
-                {'label': 'subClassOf', 'value': 'rdfs:subClassOf'},
-                {'label': 'label', 'value': 'rdfs:label'},
-                {'label': 'min', 'value': 'min'},
-                {'label': 'max', 'value': 'max'},
-                {'label': 'descended', 'value': 'desc'},
-            ],
+            options=[],
             placeholder="Symbols",
             style={'width': '81px'},
         )
-    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-        'justify-content': 'space-between'}),
+    ], FLEX_ROW_STYLE_SPACE_BETWEEN),
     html.Hr(className="my-2"),
     html.H6("SPARQL Query to evaluate:"),
     html.Div(id='select-sparql', style={'whiteSpace': 'pre-line'}),
@@ -249,8 +265,7 @@ filter_node_form = dbc.FormGroup([
         dbc.Button("Delete", id="delete_query_button", outline=True, color="secondary", size="sm"),
         dbc.Button("Clear", id="clear_query_button", outline=True, color="secondary", size="sm"),
         dbc.Button("Evaluate Query", id="evaluate_query_button", outline=True, color="secondary", size="sm"),
-    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-        'justify-content': 'space-between'}),
+    ], FLEX_ROW_STYLE_SPACE_BETWEEN),
     dbc.FormText(
         html.P([
             "Filter graph data by using ",
@@ -296,8 +311,7 @@ sparql_template_form = dbc.FormGroup([
                 ],
                 placeholder="Inconsistency Templates",
                 style={'width': '100%'}),
-        ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-            'justify-content': 'space-between'}),
+        ], FLEX_ROW_STYLE_SPACE_BETWEEN),
         color="secondary",
     ),
 ])
@@ -327,12 +341,82 @@ sparql_library_form = dbc.FormGroup([
                 ],
                 placeholder="Consistency Checks",
                 style={'width': '100%'}),
-        ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-            'justify-content': 'space-between'}),
+        ], FLEX_ROW_STYLE_SPACE_BETWEEN),
         color="secondary",
     ),
 ])
 
+sparql_info_popover = dbc.Popover(
+    html.Div("To compose a SPARQL query, use the syntax provided in the dropdown-menus or "
+             "write your own queries into the input text field and click the Add-button. "
+             "To insert graph elements into the query, toggle the Select Edge/Node-button"
+             " and click on the element you like to add. To evaluate the query click the "
+             "evaluate-button."),
+    id="info-sparql-popup", is_open=False,
+    target="info-sparql-query-button", style={'padding-left': '10px', 'width': '230px'}
+)
+
+sparql_result_form = html.Div([
+    dcc.Slider(
+        id='result-level-slider',
+        min=0,
+        max=4,
+        step=1,
+        value=DEFAULT_RESULT_LEVEL,
+        marks={
+            0: '0',
+            1: '1',
+            2: '2',
+            3: '3',
+            4: '4'
+        },
+    ),
+    # a spinner is shown while a sparql query is evaluated, the result is sent to the store once and its pages are shown
+    # in the browser, the store is only the output of the evaluation, so changes of the graph do not show the spinner
+    dcc.Loading([html.Div(id='textarea-result-output', style={'whiteSpace': 'pre-line'}),
+                 dcc.Store(id='sparql-result-store')],
+                type='circle'),
+    create_row([
+        dbc.FormText("Page", color="secondary"),
+        dbc.Input(type="number", id="result-page", min=1, max=1, step=1, value=1, size="sm",
+                  style={'width': '5em', 'margin-left': '0.5em', 'margin-right': '0.5em'}),
+        dbc.FormText(id="result-page-count", color="secondary"),
+    ]),
+    html.Hr(className="my-2"),
+])
+
+sparql_history_form = html.Div([
+    dcc.Slider(
+        id='query-history-length-slider',
+        min=1,
+        max=5,
+        step=1,
+        value=3,
+        marks={
+            1: '1',
+            2: '2',
+            3: '3',
+            4: '4',
+            5: '5'
+        },
+    ),
+    html.Div(id='sparql_query_history', style={'whiteSpace': 'pre-line'}),
+    dcc.Store(id='sparql-query-history-store'),
+    html.Hr(className="my-2"),
+    dbc.Button("Clear", id="clear-query-history-button", outline=True, color="secondary", size="sm"),
+])
+
+
+def get_feature_options(features: list):
+    """ creates the options of a select form for the features
+
+    :param features: names of the features
+    :type features: list[str]
+    :return: options with the feature as label and value
+    :rtype: list[dict]
+    """
+    return [{'label': opt, 'value': opt} for opt in features]
+
 
 def get_select_form_layout(form_id: str, options: list, label: str, description: str):
     """ creates a select (dropdown) form with provides details
@@ -383,14 +467,14 @@ def get_categorical_features(df_: pd.DataFrame, unique_limit: int = 20, blacklis
     # identify the rel cols + None
     if blacklist_features is None:
         blacklist_features = ['shape', 'label', 'id']
-    cat_features = ['None'] + df_.columns[
-        (df_.dtypes == 'object') & (df_.apply(pd.Series.nunique) <= unique_limit)].tolist()
-    # remove irrelevant cols
-    try:
-        for col in blacklist_features:
-            cat_features.remove(col)
-    except ValueError:
-        pass
+    # remove irrelevant cols first, the unique values are only counted for the remaining object columns (blacklisted
+    # columns may hold unhashable values like the color dicts of the edges)
+    blacklist_features = set(blacklist_features)
+    object_cols = [col for col in df_.columns[df_.dtypes == 'object'] if col not in blacklist_features]
+    if object_cols:
+        counts = df_[object_cols].nunique()
+        object_cols = counts.index[counts <= unique_limit].tolist()
+    cat_features = ['None'] + object_cols
     return cat_features
 
 
@@ -402,25 +486,16 @@ def get_numerical_features(df_: pd.DataFrame):
      :return: list of numerical features
      :rtype: list[str]
     """
-    # supported numerical cols
-    numerics = ['int16', 'int32', 'int64', 'float16', 'float32', 'float64']
-    # identify numerical features
-    numeric_features = ['None'] + df_.select_dtypes(include=numerics).columns.tolist()
-    # remove blacklist cols (for nodes)
-    try:
-        numeric_features.remove('size')
-    except ValueError:
-        pass
-    try:
-        numeric_features.remove('width')
-    except ValueError:
-        pass
+    # identify numerical features and remove blacklist cols (for nodes)
+    numeric_features = ['None'] + [col for col in df_.select_dtypes(include=NUMERICAL_DTYPES).columns
+                                   if col not in NUMERICAL_BLACKLIST_FEATURES]
     # return
     return numeric_features
 
 
 def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = None,
-                   directed: bool = False, vis_opts: dict = None, abox: bool = False):
+                   directed: bool = False, vis_opts: dict = None, abox: bool = False, features: dict = None,
+                   all_nodes_shown: bool = True):
     """ create and return the layout of the app
 
     :param graph_data: network data in format of visdcc
@@ -435,22 +510,62 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
      :type vis_opts: dict
      :param abox: indicates whether A-Boxes are visualized
      :type abox: bool
+     :param features: the categorical and numerical features of nodes and edges, with the keys 'cat_node',
+      'cat_edge', 'num_node' and 'num_edge', are identified from graph_data if not passed
+     :type features: dict
+     :param all_nodes_shown: indicates whether all nodes are shown at the start, if not a switch to show all nodes is
+      added to the search section
+     :type all_nodes_shown: bool
      :return: html-element of the layout
      :rtype: html.Div
     """
-    # Step 1-2: find categorical features of nodes and edges
     if color_legends is None:
         color_legends = []
-    cat_node_features = get_categorical_features(pd.DataFrame(graph_data['nodes']),
-                                                 20, ['shape', 'label', 'id', 'title', 'color'])
-    cat_edge_features = get_categorical_features(
-        pd.DataFrame(graph_data['edges']).drop(columns=['color', 'from', 'to', 'id', 'arrows']), 20,
-        ['color', 'from', 'to', 'id'])
-    # Step 3-4: Get numerical features of nodes and edges
-    num_node_features = get_numerical_features(pd.DataFrame(graph_data['nodes']))
-    num_edge_features = get_numerical_features(pd.DataFrame(graph_data['edges']))
+    if features is None:
+        nodes_df = pd.DataFrame(graph_data['nodes'])
+        edges_df = pd.DataFrame(graph_data['edges'])
+        # Step 1-2: find categorical features of nodes and edges
+        features = {'cat_node': get_categorical_features(nodes_df, 20, ['shape', 'label', 'id', 'title', 'color']),
+                    'cat_edge': get_categorical_features(edges_df, 20, ['color', 'from', 'to', 'id', 'arrows']),
+                    # Step 3-4: Get numerical features of nodes and edges
+                    'num_node': get_numerical_features(nodes_df),
+                    'num_edge': get_numerical_features(edges_df)}
+    cat_node_features = features['cat_node']
+    cat_edge_features = features['cat_edge']
+    num_node_features = features['num_node']
+    num_edge_features = features['num_edge']
+    # switch to show all nodes, it is always part of the layout as input of the main callback, but only visible if not
+    # all nodes are shown at the start
+    show_all_nodes_form = dbc.FormGroup([
+        dbc.Checklist(
+            options=[{'label': 'Show all nodes', 'value': 'show_all'}],
+            value=['show_all'] if all_nodes_shown else [],
+            id='show-all-nodes',
+            switch=True,
+        ),
+        dbc.FormText(
+            "Only T-Boxes are shown at the start, as the graph is large",
+            color="secondary",
+        )
+    ], style={'display': 'none'} if all_nodes_shown else None)
+    # the section for the data-properties of A-Boxes is only part of the layout, if A-Boxes are visualized
+    if abox:
+        logging.info("returning app-layout with section for A-Box Data-Properties")
+        abox_dp_section = [
+            create_row([
+                html.H6("A-Box Data-Properties"),
+                dbc.Button("Hide/Show", id="abox-dp-show-toggle-button", outline=True, color="secondary", size="sm"),
+            ], FLEX_ROW_STYLE_SPACE_BETWEEN),
+            dbc.Collapse([
+                a_box_dp_form,
+                html.Hr(className="my-2"),
+            ], id="abox-dp-show-toggle", is_open=False),
+        ]
+    else:
+        logging.info("returning standard app-layout")
+        abox_dp_section = []
     # Step 5: create and return the layout
-    layout_with_abox = html.Div([
+    return html.Div([
         create_row(html.H2(children="SPARQL Query Viz")),  # Title
         create_row(html.H3(children=onto.onto.name)),  # Subtitle
         create_row([
@@ -463,42 +578,31 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
                         dbc.Button("Un-/Freeze", id="freeze-physics", outline=True,
                                    color="secondary",
                                    size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
+                    ], FLEX_ROW_STYLE_SPACE_BETWEEN),
                     html.Hr(className="my-2"),
                     search_form,
+                    show_all_nodes_form,
 
                     # ---- edge selection section ----
                     create_row([
                         html.H6("Selected Edge"),
                         dbc.Button("Hide/Show", id="edge-selection-show-toggle-button", outline=True, color="secondary",
                                    size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
+                    ], FLEX_ROW_STYLE_SPACE_BETWEEN),
                     dbc.Collapse([
                         selected_edge_form,
                         html.Hr(className="my-2"),
                     ], id="edge-selection-show-toggle", is_open=False),
 
                     # ---- abox data-properties section ----
-                    create_row([
-                        html.H6("A-Box Data-Properties"),
-                        dbc.Button("Hide/Show", id="abox-dp-show-toggle-button", outline=True, color="secondary",
-                                   size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
-                    dbc.Collapse([
-                        a_box_dp_form,
-                        html.Hr(className="my-2"),
-                    ], id="abox-dp-show-toggle", is_open=False),
+                    *abox_dp_section,
 
                     # ---- SPARQL Template section ----
                     create_row([
                         html.H6("SPARQL Templates"),
                         dbc.Button("Hide/Show", id="template-show-toggle-button", outline=True, color="secondary",
                                    size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
+                    ], FLEX_ROW_STYLE_SPACE_BETWEEN),
                     dbc.Collapse([
                         sparql_template_form,
                         html.Hr(className="my-2"),
@@ -509,8 +613,7 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
                         html.H6("SPARQL Library"),
                         dbc.Button("Hide/Show", id="library-show-toggle-button", outline=True, color="secondary",
                                    size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
+                    ], FLEX_ROW_STYLE_SPACE_BETWEEN),
                     dbc.Collapse([
                         sparql_library_form,
                         html.Hr(className="my-2"),
@@ -522,17 +625,8 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
                         dbc.Button("Hide/Show", id="filter-show-toggle-button", outline=True, color="secondary",
                                    size="sm"),
                         dbc.Button("Info", id="info-sparql-query-button", outline=True, color="info", size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
-                    dbc.Popover(
-                        html.Div("To compose a SPARQL query, use the syntax provided in the dropdown-menus or "
-                                 "write your own queries into the input text field and click the Add-button. "
-                                 "To insert graph elements into the query, toggle the Select Edge/Node-button"
-                                 " and click on the element you like to add. To evaluate the query click the "
-                                 "evaluate-button."),
-                        id="info-sparql-popup", is_open=False,
-                        target="info-sparql-query-button", style={'padding-left': '10px', 'width': '230px'}
-                    ),
+                    ], FLEX_ROW_STYLE_SPACE_BETWEEN),
+                    sparql_info_popover,
                     dbc.Collapse([
                         html.Hr(className="my-2"),
                         filter_node_form,
@@ -543,25 +637,9 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
                         html.H6("SPARQL Result"),
                         dbc.Button("Hide/Show", id="result-show-toggle-button", outline=True, color="secondary",
                                    size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
+                    ], FLEX_ROW_STYLE_SPACE_BETWEEN),
                     dbc.Collapse([
-                        dcc.Slider(
-                            id='result-level-slider',
-                            min=0,
-                            max=4,
-                            step=1,
-                            value=1,
-                            marks={
-                                0: '0',
-                                1: '1',
-                                2: '2',
-                                3: '3',
-                                4: '4'
-                            },
-                        ),
-                        html.Div(id='textarea-result-output', style={'whiteSpace': 'pre-line'}),
-                        html.Hr(className="my-2"),
+                        sparql_result_form,
                     ], id="result-show-toggle", is_open=False),
 
                     # ---- SPARQL History section ----
@@ -569,27 +647,9 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
                         html.H6("SPARQL History"),
                         dbc.Button("Hide/Show", id="history-show-toggle-button", outline=True, color="secondary",
                                    size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
+                    ], FLEX_ROW_STYLE_SPACE_BETWEEN),
                     dbc.Collapse([
-                        dcc.Slider(
-                            id='query-history-length-slider',
-                            min=1,
-                            max=5,
-                            step=1,
-                            value=3,
-                            marks={
-                                1: '1',
-                                2: '2',
-                                3: '3',
-                                4: '4',
-                                5: '5'
-                            },
-                        ),
-                        html.Div(id='sparql_query_history', style={'whiteSpace': 'pre-line'}),
-                        html.Hr(className="my-2"),
-                        dbc.Button("Clear", id="clear-query-history-button", outline=True, color="secondary",
-                                   size="sm"),
+                        sparql_history_form,
                     ], id="history-show-toggle", is_open=False),
 
                     # ---- color section ----
@@ -607,19 +667,18 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
                             id="color-legend-popup", is_open=False,
                             target="color-legend-toggle"
                         ),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
+                    ], FLEX_ROW_STYLE_SPACE_BETWEEN),
                     dbc.Collapse([
                         html.Hr(className="my-2"),
                         get_select_form_layout(
                             form_id='color_nodes',
-                            options=[{'label': opt, 'value': opt} for opt in cat_node_features],
+                            options=get_feature_options(cat_node_features),
                             label='Color nodes by',
                             description='Select the categorical node property to color nodes by'
                         ),
                         get_select_form_layout(
                             form_id='color_edges',
-                            options=[{'label': opt, 'value': opt} for opt in cat_edge_features],
+                            options=get_feature_options(cat_edge_features),
                             label='Color edges by',
                             description='Select the categorical edge property to color edges by'
                         ),
@@ -630,19 +689,18 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
                         html.H6("Size"),  # heading
                         dbc.Button("Hide/Show", id="size-show-toggle-button", outline=True, color="secondary",
                                    size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
+                    ], FLEX_ROW_STYLE_SPACE_BETWEEN),
                     dbc.Collapse([
                         html.Hr(className="my-2"),
                         get_select_form_layout(
                             form_id='size_nodes',
-                            options=[{'label': opt, 'value': opt} for opt in num_node_features],
+                            options=get_feature_options(num_node_features),
                             label='Size nodes by',
                             description='Select the numerical node property to size nodes by'
                         ),
                         get_select_form_layout(
                             form_id='size_edges',
-                            options=[{'label': opt, 'value': opt} for opt in num_edge_features],
+                            options=get_feature_options(num_edge_features),
                             label='Size edges by',
                             description='Select the numerical edge property to size edges by'
                         ),
@@ -651,212 +709,13 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
                 ], className="card", style={'padding': '5px', 'background': '#e5e5e5'}),
             ], width=3, style={'display': 'flex', 'justify-content': 'center', 'align-items': 'center'}, align="start"),
             # graph
-            dbc.Col(
-                visdcc.Network(
-                    id='graph',
-                    data=graph_data,
-                    selection={'nodes': [], 'edges': []},
-                    options=get_options(directed, vis_opts)),
-                width=9, align="start")])
-    ])
-    if abox:
-        logging.info("returning app-layout with section for A-Box Data-Properties")
-        return layout_with_abox
-    logging.info("returning standard app-layout")
-    return html.Div([
-        create_row(html.H2(children="SPARQL Query Viz")),  # Title
-        create_row(html.H3(children=onto.onto.name)),  # Subtitle
-        create_row([
             dbc.Col([
-                # setting panel
-                dbc.Form([
-                    # ---- search section ----
-                    create_row([
-                        html.H6("Search"),
-                        dbc.Button("Un-/Freeze", id="freeze-physics", outline=True,
-                                   color="secondary",
-                                   size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
-                    html.Hr(className="my-2"),
-                    search_form,
-
-                    # ---- edge selection section ----
-                    create_row([
-                        html.H6("Selected Edge"),
-                        dbc.Button("Hide/Show", id="edge-selection-show-toggle-button", outline=True, color="secondary",
-                                   size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
-                    dbc.Collapse([
-                        selected_edge_form,
-                        html.Hr(className="my-2"),
-                    ], id="edge-selection-show-toggle", is_open=False),
-
-                    # ---- SPARQL Template section ----
-                    create_row([
-                        html.H6("SPARQL Templates"),
-                        dbc.Button("Hide/Show", id="template-show-toggle-button", outline=True, color="secondary",
-                                   size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
-                    dbc.Collapse([
-                        sparql_template_form,
-                        html.Hr(className="my-2"),
-                    ], id="template-show-toggle", is_open=False),
-
-                    # ---- SPARQL Library section ----
-                    create_row([
-                        html.H6("SPARQL Library"),
-                        dbc.Button("Hide/Show", id="library-show-toggle-button", outline=True, color="secondary",
-                                   size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
-                    dbc.Collapse([
-                        sparql_library_form,
-                        html.Hr(className="my-2"),
-                    ], id="library-show-toggle", is_open=False),
-
-                    # ---- SPARQL Query section ----
-                    create_row([
-                        html.H6("SPARQL Query"),
-                        dbc.Button("Hide/Show", id="filter-show-toggle-button", outline=True, color="secondary",
-                                   size="sm"),
-                        dbc.Button("Info", id="info-sparql-query-button", outline=True, color="info", size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
-                    dbc.Popover(
-                        html.Div("To compose a SPARQL query, use the syntax provided in the dropdown-menus or "
-                                 "write your own queries into the input text field and click the Add-button. "
-                                 "To insert graph elements into the query, toggle the Select Edge/Node-button"
-                                 " and click on the element you like to add. To evaluate the query click the "
-                                 "evaluate-button."),
-                        id="info-sparql-popup", is_open=False,
-                        target="info-sparql-query-button", style={'padding-left': '10px', 'width': '230px'}
-                    ),
-                    dbc.Collapse([
-                        html.Hr(className="my-2"),
-                        filter_node_form,
-                    ], id="filter-show-toggle", is_open=False),
-
-                    # ---- SPARQL Result section ----
-                    create_row([
-                        html.H6("SPARQL Result"),
-                        dbc.Button("Hide/Show", id="result-show-toggle-button", outline=True, color="secondary",
-                                   size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
-                    dbc.Collapse([
-                        dcc.Slider(
-                            id='result-level-slider',
-                            min=0,
-                            max=4,
-                            step=1,
-                            value=1,
-                            marks={
-                                0: '0',
-                                1: '1',
-                                2: '2',
-                                3: '3',
-                                4: '4'
-                            },
-                        ),
-                        html.Div(id='textarea-result-output', style={'whiteSpace': 'pre-line'}),
-                        html.Hr(className="my-2"),
-                    ], id="result-show-toggle", is_open=False),
-
-                    # ---- SPARQL History section ----
-                    create_row([
-                        html.H6("SPARQL History"),
-                        dbc.Button("Hide/Show", id="history-show-toggle-button", outline=True, color="secondary",
-                                   size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
-                    dbc.Collapse([
-                        dcc.Slider(
-                            id='query-history-length-slider',
-                            min=1,
-                            max=5,
-                            step=1,
-                            value=3,
-                            marks={
-                                1: '1',
-                                2: '2',
-                                3: '3',
-                                4: '4',
-                                5: '5'
-                            },
-                        ),
-                        html.Div(id='sparql_query_history', style={'whiteSpace': 'pre-line'}),
-                        html.Hr(className="my-2"),
-                        dbc.Button("Clear", id="clear-query-history-button", outline=True, color="secondary",
-                                   size="sm"),
-                    ], id="history-show-toggle", is_open=False),
-
-                    # ---- color section ----
-                    create_row([
-                        html.H6("Color"),  # heading
-                        html.Div([
-                            dbc.Button("Hide/Show", id="color-show-toggle-button", outline=True, color="secondary",
-                                       size="sm"),  # legend
-                            dbc.Button("Legends", id="color-legend-toggle", outline=True, color="secondary", size="sm"),
-                            # legend
-                        ]),
-                        # add the legends popup
-                        dbc.Popover(
-                            children=color_legends,
-                            id="color-legend-popup", is_open=False,
-                            target="color-legend-toggle"
-                        ),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
-                    dbc.Collapse([
-                        html.Hr(className="my-2"),
-                        get_select_form_layout(
-                            form_id='color_nodes',
-                            options=[{'label': opt, 'value': opt} for opt in cat_node_features],
-                            label='Color nodes by',
-                            description='Select the categorical node property to color nodes by'
-                        ),
-                        get_select_form_layout(
-                            form_id='color_edges',
-                            options=[{'label': opt, 'value': opt} for opt in cat_edge_features],
-                            label='Color edges by',
-                            description='Select the categorical edge property to color edges by'
-                        ),
-                    ], id="color-show-toggle", is_open=False),
-
-                    # ---- size section ----
-                    create_row([
-                        html.H6("Size"),  # heading
-                        dbc.Button("Hide/Show", id="size-show-toggle-button", outline=True, color="secondary",
-                                   size="sm"),
-                    ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
-                        'justify-content': 'space-between'}),
-                    dbc.Collapse([
-                        html.Hr(className="my-2"),
-                        get_select_form_layout(
-                            form_id='size_nodes',
-                            options=[{'label': opt, 'value': opt} for opt in num_node_features],
-                            label='Size nodes by',
-                            description='Select the numerical node property to size nodes by'
-                        ),
-                        get_select_form_layout(
-                            form_id='size_edges',
-                            options=[{'label': opt, 'value': opt} for opt in num_edge_features],
-                            label='Size edges by',
-                            description='Select the numerical edge property to size edges by'
-                        ),
-                    ], id="size-show-toggle", is_open=False),
-
-                ], className="card", style={'padding': '5px', 'background': '#e5e5e5'}),
-            ], width=3, style={'display': 'flex', 'justify-content': 'center', 'align-items': 'center'}, align="start"),
-            # graph
-            dbc.Col(
                 visdcc.Network(
                     id='graph',
                     data=graph_data,
                     selection={'nodes': [], 'edges': []},
                     options=get_options(directed, vis_opts)),
+                # changes of the graph data, which are merged into the graph data in the browser
+                dcc.Store(id='graph-delta')],
                 width=9, align="start")])
     ])
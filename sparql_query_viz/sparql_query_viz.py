@@ -7,14 +7,21 @@ Main class for SPARQL-Query-Viz ontology visualization and querying GUI
 """
 
 # import
+import collections
 import datetime
+import functools
+import itertools
 import logging
 import os
 import pyparsing
 import dash
 from dash import html
 import dash_bootstrap_components as dbc
-from dash.dependencies import Input, Output, State
+import numpy as np
+import pandas as pd
+from dash.dependencies import ClientsideFunction, Input, Output, State
+from dash.exceptions import PreventUpdate
+from rdflib.plugins.sparql import prepareQuery
 
 # basic configuration for logging
 dir_file = os.path.dirname(__file__)
@@ -28,7 +35,8 @@ from ontor import OntoEditor
 from .datasets.parse_dataframe import parse_dataframe
 from .datasets.parse_ontology import *
 from .layout import get_app_layout, get_distinct_colors, create_color_legend, get_categorical_features, \
-    get_numerical_features, DEFAULT_COLOR, DEFAULT_NODE_SIZE, DEFAULT_EDGE_SIZE, get_options
+    get_numerical_features, DEFAULT_COLOR, DEFAULT_NODE_SIZE, DEFAULT_EDGE_SIZE, get_options, SPARQL_KEYWORD_OPTIONS, \
+    SPARQL_VARIABLE_OPTIONS, SPARQL_SYNTAX_OPTIONS, DEFAULT_RESULT_LEVEL
 
 # CONSTANTS
 PREFIXES = 'PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> ' \
@@ -37,35 +45,23 @@ PREFIXES = 'PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> ' \
            'PREFIX xsd: <http://www.w3.org/2001/XMLSchema#> ' \
            'PREFIX owlready: <http://www.lesfleursdunormal.fr/static/_downloads/owlready_ontology.owl#> ' \
            'PREFIX obo: <http://purl.obolibrary.org/obo/>'
+# maximum number of queries shown in the sparql query history (maximum of the query-history-length-slider)
+MAX_QUERY_HISTORY_LENGTH = 5
+# maximum number of failed sparql queries whose error messages are remembered
+MAX_INVALID_SPARQL_QUERIES = 128
 
 
-def _callback_search_graph(graph_data: dict, search_text: str):
-    """ only show the nodes which match the search text
-    
-    :param graph_data: network data in format of visdcc
-     :type graph_data: dict
-     :param search_text: the text the graph will be searched for
-     :type search_text: str
-     :return: network data with only the matching results in format of visdcc
-     :rtype: dict
+@functools.lru_cache(maxsize=128)
+def prepare_sparql_query(sparql_query: str):
+    """ parses and translates the sparql query together with the standard prefixes, the prepared query is cached
+    and reused for identical query strings
+
+    :param sparql_query: the sparql query to prepare
+     :type sparql_query: str
+     :return: the prepared sparql query
+     :rtype: rdflib.plugins.sparql.sparql.Query
     """
-    nodes = graph_data['nodes']
-    edges = graph_data['edges']
-    for node in nodes:
-        if (search_text.lower() not in node['label'].lower()) and (search_text not in node['label']):
-            node['hidden'] = True
-        else:
-            node['hidden'] = False
-    for edge in edges:
-        if search_text in edge['label'].lower():
-            for node in nodes:
-                if edge['from'].lower() == node['label'].lower():
-                    node['hidden'] = False
-                elif edge['to'].lower() == node['label'].lower():
-                    node['hidden'] = False
-    graph_data['nodes'] = nodes
-    graph_data['edges'] = edges
-    return graph_data
+    return prepareQuery(PREFIXES + sparql_query)
 
 
 def get_color_popover_legend_children(node_value_color_mapping: dict = None, edge_value_color_mapping: dict = None):
@@ -91,21 +87,12 @@ def get_color_popover_legend_children(node_value_color_mapping: dict = None, edg
         if legends is None:
             legends = {}
         _popover_legend_children = [dbc.PopoverHeader(f"{title} legends")]
-        # add values if present
+        # add values if present, keys with two parts get a legend for each part
         if len(legends) > 0:
-            for key, value in legends.items():
-                partition = key.partition(',\n ')
-                if partition[2] == '':
-                    _popover_legend_children.append(
-                        create_color_legend(key, value)
-                    )
-                else:
-                    _popover_legend_children.append(
-                        create_color_legend(partition[0], value)
-                    )
-                    _popover_legend_children.append(
-                        create_color_legend(partition[2], value)
-                    )
+            parts = [(key.partition(',\n '), key, value) for key, value in legends.items()]
+            _popover_legend_children.extend(create_color_legend(text, value)
+                                            for (first, _, second), key, value in parts
+                                            for text in ((first, second) if second else (key,)))
         else:  # otherwise add filler
             _popover_legend_children.append(dbc.PopoverBody(f"no {title.lower()} colored!"))
 
@@ -119,7 +106,8 @@ def get_color_popover_legend_children(node_value_color_mapping: dict = None, edg
     return popover_legend_children
 
 
-def get_nodes_to_be_shown(graph_data: dict, res_list: list = None, number_of_edges_to_be_shown_around_result: int = 1):
+def get_nodes_to_be_shown(graph_data: dict, res_list: list = None, number_of_edges_to_be_shown_around_result: int = 1,
+                          edges_df: pd.DataFrame = None, res_names: set = None):
     """ gets the nodes in graph_data that are listed in res_list and therefore will be shown in the graph NOTE: with
     number_of_edges_to_be_shown_around_result how many layers of the surrounding neighbourhood will be displayed
 
@@ -129,38 +117,70 @@ def get_nodes_to_be_shown(graph_data: dict, res_list: list = None, number_of_edg
      :type res_list: list
      :param number_of_edges_to_be_shown_around_result: how many layers of the surrounding neighbourhood will be displayed
      :type number_of_edges_to_be_shown_around_result: int
+     :param edges_df: DataFrame of the edges in graph_data, is built from graph_data if not passed
+     :type edges_df: pd.DataFrame
+     :param res_names: names of the results in res_list that are objects (A-/ T-Box), are taken from res_list if not
+      passed
+     :type res_names: set
      :return: filtered node graph_data and the result nodes that will be selected
      :rtype: tuple[list, list]
      """
     if res_list is None:
         res_list = []
-    filtered_node_data = []
+    if edges_df is None:
+        edges_df = pd.DataFrame(graph_data['edges'], columns=['from', 'to'])
     n = 1
-    for node in graph_data['nodes']:
-        for result in res_list:
-            try:
-                res_name = result.name
-            except AttributeError:
-                res_name = ''
-            if node['id'] == res_name:
-                filtered_node_data.append(node)
-    node_selection = filtered_node_data.copy()
-    current_level_res_list = node_selection.copy()
-    next_level_res_list = []
-    while n <= number_of_edges_to_be_shown_around_result:
-        for result in current_level_res_list:
-            for edge in graph_data['edges']:
-                if edge['from'] == result['id']:
-                    for node in graph_data['nodes']:
-                        if node['id'] == edge['to']:
-                            filtered_node_data.append(node)
-                            next_level_res_list.append(node)
-        current_level_res_list = next_level_res_list.copy()
-        next_level_res_list = []
+    # names of the results that are objects (A-/ T-Box) in the graph
+    if res_names is None:
+        res_names = {result.name for result in res_list if hasattr(result, 'name')}
+    node_selection = [node for node in graph_data['nodes'] if node['id'] in res_names]
+    shown_ids = {node['id'] for node in node_selection}
+    current_level_ids = list(shown_ids)
+    while n <= number_of_edges_to_be_shown_around_result and current_level_ids:
+        # follow all edges starting at the current level at once
+        next_level_ids = edges_df.loc[edges_df['from'].isin(current_level_ids), 'to'].unique().tolist()
+        shown_ids.update(next_level_ids)
+        current_level_ids = next_level_ids
         n = n + 1
+    filtered_node_data = [node for node in graph_data['nodes'] if node['id'] in shown_ids]
     return filtered_node_data, node_selection
 
 
+def _map_to_colors(values: pd.Series, for_nodes: bool = True):
+    """ maps every distinct value to a distinct color, the values are encoded as positions of their distinct value
+    once and the colors are taken from the palette by these positions
+
+    :param values: the values of the feature that is used for coloring
+     :type values: pd.Series
+     :param for_nodes: indicates whether nodes or edges will be colored
+     :type for_nodes: bool
+     :return: the color of every value and the value-color mapping
+     :rtype: tuple[np.ndarray, dict]
+    """
+    unique_values = values.unique()
+    colors = get_distinct_colors(len(unique_values), for_nodes=for_nodes)
+    value_color_mapping = {x: y for x, y in zip(unique_values, colors)}
+    # values without a color in the palette are not colored
+    palette = np.full(len(unique_values), np.nan, dtype=object)
+    palette[:len(colors)] = colors
+    codes = pd.Index(unique_values).get_indexer(values)
+    return palette[codes], value_color_mapping
+
+
+def _project_column(elements: list, key: str, values: list):
+    """ writes the values of a DataFrame column back into the nodes/ edges in format of visdcc
+
+    :param elements: nodes or edges in format of visdcc
+     :type elements: list
+     :param key: the attribute of the nodes/ edges that is set
+     :type key: str
+     :param values: the values of the column, in the same order as elements
+     :type values: list
+    """
+    for element, value in zip(elements, values):
+        element[key] = value
+
+
 class SQV:
     """ The main visualization class of SPARQL-Query-Viz
     """
@@ -185,21 +205,112 @@ class SQV:
         self.logger.info("begin parsing data from dataframes to visdcc data format...")
         self.data, self.scaling_vars = parse_dataframe(self.edge_df, self.node_df)
         self.logger.info("...successfully parsed data from dataframes to visdcc data format")
-        self.filtered_data = self.data.copy()
+        # index the nodes and edges by their id, the indexed dicts are the same objects as in self.data
+        self.nodes_by_id = {node['id']: node for node in self.data['nodes']}
+        self.edges_by_id = {edge['id']: edge for edge in self.data['edges']}
+        # the nodes and edges currently shown are marked in boolean masks over the nodes and edges of self.data
+        self.node_positions = {node['id']: position for position, node in enumerate(self.data['nodes'])}
+        self.element_arrays = {}
+        self.masks = {}
+        for element in ('nodes', 'edges'):
+            self.element_arrays[element] = np.empty(len(self.data[element]), dtype=object)
+            self.element_arrays[element][:] = self.data[element]
+            self.masks[element] = np.ones(len(self.data[element]), dtype=bool)
+        self.filtered_data = {'nodes': self.data['nodes'], 'edges': self.data['edges']}
+        # DataFrames of self.data are cached together with the version of self.data they were built from
+        self.data_version = 0
+        self.data_frames = {}
+        # colors of the nodes/ edges and value-color mappings by feature, cached like the DataFrames
+        self.feature_colors = {}
+        self.features = None
+        # indicates whether all nodes are shown when no sparql query filters them, see show_default_nodes
+        self.show_all_nodes = True
         self.node_value_color_mapping = {}
         self.edge_value_color_mapping = {}
+        # last values of the inputs of the main callback and the content of the color mappings of the shown legend
+        self.last_input_values = {}
+        self.shown_legend_key = ((), ())
         self.sparql_query = ''
         self.sparql_query_last_input = ['']
         self.sparql_query_last_input_type = ['']
-        self.sparql_query_history = ''
+        # the last evaluated queries, each as one numbered line
+        self.sparql_query_history = collections.deque(maxlen=MAX_QUERY_HISTORY_LENGTH)
         self.counter_query_history = 0
         self.sparql_query_result = ''
         self.sparql_query_result_list = []
+        self.sparql_query_result_names = frozenset()
+        # the result nodes of the last evaluated sparql query, they are selected in the graph by the main callback
+        self.sparql_query_selection = {'nodes': [], 'edges': []}
+        # error messages of sparql queries that failed, by query, the oldest ones are forgotten first
+        self.invalid_sparql_queries = collections.OrderedDict()
         self.selected_template = ''
         self.nodes_selected_for_template = 0
         self.selected_node_for_template = ''
         self.edges_selected_for_template = 0
         self.selected_edge_for_template = ''
+        # the ontology is not changed while the app is running, so results of evaluated queries can be reused
+        self.run_sparql_query = functools.lru_cache(maxsize=128)(self.run_sparql_query)
+        self.get_nodes_around_result = functools.lru_cache(maxsize=128)(self.get_nodes_around_result)
+        # the app created last, together with the arguments it was created with
+        self.app = None
+        self.app_key = None
+
+    def run_sparql_query(self, sparql_query: str):
+        """ evaluates the sparql query on the ontology, the standard prefixes are added in front of the query
+
+        :param sparql_query: the sparql query to evaluate
+         :type sparql_query: str
+         :return: the results of the sparql query
+         :rtype: tuple
+        """
+        rdflib_onto = self.onto.onto_world.as_rdflib_graph()
+        return tuple(rdflib_onto.query_owlready(prepare_sparql_query(sparql_query)))
+
+    def get_nodes_around_result(self, res_names: frozenset, shown_result_level: int = DEFAULT_RESULT_LEVEL):
+        """ gets the nodes to be shown around the result of a sparql query and the result nodes that will be selected
+
+        :param res_names: names of the results that are objects (A-/ T-Box)
+         :type res_names: frozenset
+         :param shown_result_level: how many layers of the surrounding neighbourhood will be displayed
+         :type shown_result_level: int
+         :return: the nodes to be shown and the result nodes that will be selected
+         :rtype: tuple[list, list]
+        """
+        return get_nodes_to_be_shown(self.data, None, shown_result_level, self.get_data_frame('edges'), res_names)
+
+    def get_data_frame(self, element: str = 'nodes'):
+        """ returns the nodes or edges of self.data as DataFrame, the DataFrame is only rebuilt if self.data was
+        changed since the last call
+
+        :param element: indicates whether the 'nodes' or the 'edges' are returned
+         :type element: str
+         :return: DataFrame of the nodes or edges
+         :rtype: pd.DataFrame
+        """
+        version, data_frame = self.data_frames.get(element, (None, None))
+        if version != self.data_version:
+            data_frame = pd.DataFrame(self.data[element])
+            self.data_frames[element] = (self.data_version, data_frame)
+        return data_frame
+
+    def get_feature_colors(self, element: str, feature: str):
+        """ returns the color of every node or edge and the value-color mapping for the feature, they are only
+        computed again if self.data was changed since the last call
+
+        :param element: indicates whether the 'nodes' or the 'edges' are colored
+         :type element: str
+         :param feature: the feature that is used for coloring
+         :type feature: str
+         :return: the color of every node or edge and the value-color mapping
+         :rtype: tuple[list, dict]
+        """
+        version, colors, value_color_mapping = self.feature_colors.get((element, feature), (None, None, None))
+        if version != self.data_version:
+            colors, value_color_mapping = _map_to_colors(self.get_data_frame(element)[feature],
+                                                         for_nodes=element == 'nodes')
+            colors = colors.tolist()
+            self.feature_colors[(element, feature)] = (self.data_version, colors, value_color_mapping)
+        return colors, value_color_mapping
 
     def edit_edge_appearance(self, directed: bool = True):
         """ edits the arrow heads of is_a relations
@@ -213,6 +324,7 @@ class SQV:
             else:
                 arrow_type = {'arrows': {'to': {'enabled': directed, 'type': 'arrow'}}}
             edge.update(arrow_type)
+        self.data_version = self.data_version + 1
 
     def clear_selection_for_template_query(self):
         """ deletes/ clears the selection made by the user for query templates
@@ -234,124 +346,122 @@ class SQV:
         if len(selection['nodes']) > 0:
             max_number_of_selected_nodes = -1
             placeholder = ''
-            for node in self.data['nodes']:
-                if [node['id']] == selection['nodes']:
-                    self.sparql_query_last_input.append(' :' + node['id'])
-                    if template == "template_2.sparql":
-                        max_number_of_selected_nodes = 1
-                    elif template == "template_3.sparql":
-                        max_number_of_selected_nodes = 3
-                    elif template == "template_4.sparql":
-                        max_number_of_selected_nodes = 1
-                    elif template == "template_5.sparql":
-                        max_number_of_selected_nodes = 1
-                    elif template == "template_6.sparql":
-                        max_number_of_selected_nodes = 2
-                    elif template == "template_7.sparql":
-                        max_number_of_selected_nodes = 1
-                    elif template == "template_8.sparql":
-                        max_number_of_selected_nodes = 1
-                    elif template == "template_9.sparql":
-                        max_number_of_selected_nodes = 1
-                    elif template == "template_10.sparql":
-                        max_number_of_selected_nodes = 1
-                    elif template == "template_11.sparql":
-                        max_number_of_selected_nodes = 2
-                    elif template == "template_12.sparql":
-                        max_number_of_selected_nodes = 1
-                    elif template == "template_13.sparql":
-                        max_number_of_selected_nodes = 1
-                    elif template == "template_14.sparql":
-                        max_number_of_selected_nodes = 2
-                    elif template == "template_15.sparql":
-                        max_number_of_selected_nodes = 2
-                    elif template == "template_16.sparql":
-                        max_number_of_selected_nodes = 3
-                    elif template == "template_17.sparql":
-                        max_number_of_selected_nodes = 3
-                    elif template == "template_18.sparql":
-                        max_number_of_selected_nodes = 3
-                    elif template == "template_19.sparql":
-                        max_number_of_selected_nodes = 4
-                    elif template == "template_20.sparql":
-                        max_number_of_selected_nodes = 3
-                    if '[:node]' in self.sparql_query:
-                        placeholder = "[:node]"
-                    elif '[:node1]' in self.sparql_query:
-                        placeholder = "[:node1]"
-                    elif '[:node2]' in self.sparql_query:
-                        placeholder = "[:node2]"
-                    elif '[:node3]' in self.sparql_query:
-                        placeholder = "[:node3]"
-                    if self.nodes_selected_for_template < max_number_of_selected_nodes and template and (
-                            placeholder != ''):
-                        self.sparql_query = self.sparql_query.replace(placeholder, self.sparql_query_last_input[-1])
-                        self.nodes_selected_for_template = self.nodes_selected_for_template + 1
-                        self.selected_node_for_template = self.sparql_query_last_input[-1]
-                        self.sparql_query_last_input_type.append('select_node')
-                    elif self.nodes_selected_for_template == max_number_of_selected_nodes:
-                        pass
-                    else:
-                        self.sparql_query = self.sparql_query + self.sparql_query_last_input[-1]
-                        self.sparql_query_last_input_type.append('user_input')
-                    self.logger.info("%s added to sparql query", self.sparql_query_last_input[-1])
+            for node in self.get_selected_elements(selection, 'nodes'):
+                self.sparql_query_last_input.append(' :' + node['id'])
+                if template == "template_2.sparql":
+                    max_number_of_selected_nodes = 1
+                elif template == "template_3.sparql":
+                    max_number_of_selected_nodes = 3
+                elif template == "template_4.sparql":
+                    max_number_of_selected_nodes = 1
+                elif template == "template_5.sparql":
+                    max_number_of_selected_nodes = 1
+                elif template == "template_6.sparql":
+                    max_number_of_selected_nodes = 2
+                elif template == "template_7.sparql":
+                    max_number_of_selected_nodes = 1
+                elif template == "template_8.sparql":
+                    max_number_of_selected_nodes = 1
+                elif template == "template_9.sparql":
+                    max_number_of_selected_nodes = 1
+                elif template == "template_10.sparql":
+                    max_number_of_selected_nodes = 1
+                elif template == "template_11.sparql":
+                    max_number_of_selected_nodes = 2
+                elif template == "template_12.sparql":
+                    max_number_of_selected_nodes = 1
+                elif template == "template_13.sparql":
+                    max_number_of_selected_nodes = 1
+                elif template == "template_14.sparql":
+                    max_number_of_selected_nodes = 2
+                elif template == "template_15.sparql":
+                    max_number_of_selected_nodes = 2
+                elif template == "template_16.sparql":
+                    max_number_of_selected_nodes = 3
+                elif template == "template_17.sparql":
+                    max_number_of_selected_nodes = 3
+                elif template == "template_18.sparql":
+                    max_number_of_selected_nodes = 3
+                elif template == "template_19.sparql":
+                    max_number_of_selected_nodes = 4
+                elif template == "template_20.sparql":
+                    max_number_of_selected_nodes = 3
+                if '[:node]' in self.sparql_query:
+                    placeholder = "[:node]"
+                elif '[:node1]' in self.sparql_query:
+                    placeholder = "[:node1]"
+                elif '[:node2]' in self.sparql_query:
+                    placeholder = "[:node2]"
+                elif '[:node3]' in self.sparql_query:
+                    placeholder = "[:node3]"
+                if self.nodes_selected_for_template < max_number_of_selected_nodes and template and (
+                        placeholder != ''):
+                    self.sparql_query = self.sparql_query.replace(placeholder, self.sparql_query_last_input[-1])
+                    self.nodes_selected_for_template = self.nodes_selected_for_template + 1
+                    self.selected_node_for_template = self.sparql_query_last_input[-1]
+                    self.sparql_query_last_input_type.append('select_node')
+                elif self.nodes_selected_for_template == max_number_of_selected_nodes:
+                    pass
+                else:
+                    self.sparql_query = self.sparql_query + self.sparql_query_last_input[-1]
+                    self.sparql_query_last_input_type.append('user_input')
+                self.logger.info("%s added to sparql query", self.sparql_query_last_input[-1])
         elif len(selection['edges']) > 0:
             max_number_of_selected_edges = -1
             placeholder = ''
-            for edge in self.data['edges']:
-                if [edge['id']] == selection['edges']:
-                    self.sparql_query_last_input.append(' :' + edge['label'])
-                    if template == "template_2.sparql":
-                        max_number_of_selected_edges = 1
-                    elif template == "template_3.sparql":
-                        max_number_of_selected_edges = 2
-                    elif template == "template_5.sparql":
-                        max_number_of_selected_edges = 1
-                    elif template == "template_6.sparql":
-                        max_number_of_selected_edges = 1
-                    elif template == "template_7.sparql":
-                        max_number_of_selected_edges = 2
-                    elif template == "template_8.sparql":
-                        max_number_of_selected_edges = 1
-                    elif template == "template_9.sparql":
-                        max_number_of_selected_edges = 1
-                    elif template == "template_11.sparql":
-                        max_number_of_selected_edges = 1
-                    elif template == "template_12.sparql":
-                        max_number_of_selected_edges = 1
-                    elif template == "template_14.sparql":
-                        max_number_of_selected_edges = 1
-                    elif template == "template_15.sparql":
-                        max_number_of_selected_edges = 1
-                    elif template == "template_16.sparql":
-                        max_number_of_selected_edges = 3
-                    elif template == "template_17.sparql":
-                        max_number_of_selected_edges = 2
-                    elif template == "template_18.sparql":
-                        max_number_of_selected_edges = 2
-                    elif template == "template_19.sparql":
-                        max_number_of_selected_edges = 3
-                    elif template == "template_20.sparql":
-                        max_number_of_selected_edges = 1
-                    if '[:edge]' in self.sparql_query:
-                        placeholder = "[:edge]"
-                    elif '[:edge1]' in self.sparql_query:
-                        placeholder = "[:edge1]"
-                    elif '[:edge2]' in self.sparql_query:
-                        placeholder = "[:edge2]"
-                    elif '[:edge3]' in self.sparql_query:
-                        placeholder = "[:edge3]"
-                    if self.edges_selected_for_template < max_number_of_selected_edges and (placeholder != ''):
-                        self.sparql_query = self.sparql_query.replace(placeholder, self.sparql_query_last_input[-1])
-                        self.edges_selected_for_template = self.edges_selected_for_template + 1
-                        self.selected_edge_for_template = self.sparql_query_last_input[-1]
-                        self.sparql_query_last_input_type.append('select_edge')
-                    elif self.edges_selected_for_template == max_number_of_selected_edges:
-                        pass
-                    else:
-                        self.sparql_query = self.sparql_query + self.sparql_query_last_input[-1]
-                        self.sparql_query_last_input_type.append('user_input')
-                    self.logger.info("%s added to sparql query", self.sparql_query_last_input[-1])
+            for edge in self.get_selected_elements(selection, 'edges'):
+                self.sparql_query_last_input.append(' :' + edge['label'])
+                if template == "template_2.sparql":
+                    max_number_of_selected_edges = 1
+                elif template == "template_3.sparql":
+                    max_number_of_selected_edges = 2
+                elif template == "template_5.sparql":
+                    max_number_of_selected_edges = 1
+                elif template == "template_6.sparql":
+                    max_number_of_selected_edges = 1
+                elif template == "template_7.sparql":
+                    max_number_of_selected_edges = 2
+                elif template == "template_8.sparql":
+                    max_number_of_selected_edges = 1
+                elif template == "template_9.sparql":
+                    max_number_of_selected_edges = 1
+                elif template == "template_11.sparql":
+                    max_number_of_selected_edges = 1
+                elif template == "template_12.sparql":
+                    max_number_of_selected_edges = 1
+                elif template == "template_14.sparql":
+                    max_number_of_selected_edges = 1
+                elif template == "template_15.sparql":
+                    max_number_of_selected_edges = 1
+                elif template == "template_16.sparql":
+                    max_number_of_selected_edges = 3
+                elif template == "template_17.sparql":
+                    max_number_of_selected_edges = 2
+                elif template == "template_18.sparql":
+                    max_number_of_selected_edges = 2
+                elif template == "template_19.sparql":
+                    max_number_of_selected_edges = 3
+                elif template == "template_20.sparql":
+                    max_number_of_selected_edges = 1
+                if '[:edge]' in self.sparql_query:
+                    placeholder = "[:edge]"
+                elif '[:edge1]' in self.sparql_query:
+                    placeholder = "[:edge1]"
+                elif '[:edge2]' in self.sparql_query:
+                    placeholder = "[:edge2]"
+                elif '[:edge3]' in self.sparql_query:
+                    placeholder = "[:edge3]"
+                if self.edges_selected_for_template < max_number_of_selected_edges and (placeholder != ''):
+                    self.sparql_query = self.sparql_query.replace(placeholder, self.sparql_query_last_input[-1])
+                    self.edges_selected_for_template = self.edges_selected_for_template + 1
+                    self.selected_edge_for_template = self.sparql_query_last_input[-1]
+                    self.sparql_query_last_input_type.append('select_edge')
+                elif self.edges_selected_for_template == max_number_of_selected_edges:
+                    pass
+                else:
+                    self.sparql_query = self.sparql_query + self.sparql_query_last_input[-1]
+                    self.sparql_query_last_input_type.append('user_input')
+                self.logger.info("%s added to sparql query", self.sparql_query_last_input[-1])
 
     def delete_last_user_input(self):
         if not self.sparql_query_last_input_type:
@@ -374,10 +484,20 @@ class SQV:
         """ adds the evaluated query to the query history
         """
         self.counter_query_history = self.counter_query_history + 1
-        self.sparql_query_history = self.sparql_query_history + str(
-            self.counter_query_history) + ": " + self.sparql_query + '\n'
+        self.sparql_query_history.append(str(self.counter_query_history) + ": " + self.sparql_query + '\n')
+
+    def add_to_invalid_sparql_queries(self, result: str):
+        """ remembers the error message of the failed query, the oldest failed query is forgotten if more than
+        MAX_INVALID_SPARQL_QUERIES are remembered
 
-    def _callback_filter_nodes(self, graph_data: dict, shown_result_level: int = 1):
+        :param result: the error message of the failed query
+         :type result: str
+        """
+        self.invalid_sparql_queries[self.sparql_query] = result
+        if len(self.invalid_sparql_queries) > MAX_INVALID_SPARQL_QUERIES:
+            self.invalid_sparql_queries.popitem(last=False)
+
+    def _callback_filter_nodes(self, graph_data: dict, shown_result_level: int = DEFAULT_RESULT_LEVEL):
         """ filters the nodes based on the SPARQL query syntax
 
         :param graph_data: network data in format of visdcc
@@ -387,15 +507,20 @@ class SQV:
          :return: the filtered graph_data, the result nodes as string, and the nodes  that will be selected
          :rtype: tuple[dict, str, dict]
         """
-        self.filtered_data = self.data.copy()
+        self.show_default_nodes()
         selection = {'nodes': [], 'edges': []}
-        if self.sparql_query:
+        if self.sparql_query in self.invalid_sparql_queries:
+            # the query already failed before, it is not parsed and evaluated again
+            graph_data = self.filtered_data
+            result = self.invalid_sparql_queries[self.sparql_query]
+            self.sparql_query_result = result
+            self.logger.warning("sparql query passed from user is known to include an error")
+        elif self.sparql_query:
             try:
-                rdflib_onto = self.onto.onto_world.as_rdflib_graph()
-                res_list = list(rdflib_onto.query_owlready(PREFIXES + self.sparql_query))
+                res_list = self.run_sparql_query(self.sparql_query)
 
                 if not res_list:
-                    graph_data = self.data
+                    graph_data = self.filtered_data
                     result = "No results for this SPARQL query."
                     self.sparql_query_result = result
                     self.add_to_query_history()
@@ -403,66 +528,125 @@ class SQV:
                     self.logger.info("result for passed sparql query is empty")
                     return graph_data, result, selection
                 else:
-                    if type(res_list[0]) == list:
-                        flat_res_list = [x for l in res_list for x in l]
-                    else:
-                        flat_res_list = res_list
+                    rows = res_list if type(res_list[0]) == list else [res_list]
+                    # flatten the rows, collect the result lines and check for objects (A-/ T-Box) in the graph in a
+                    # single pass over the results
+                    flat_res_list = []
+                    result_lines = []
+                    res_names = set()
+                    for flat_res in itertools.chain.from_iterable(rows):
+                        flat_res_list.append(flat_res)
+                        if hasattr(flat_res, 'name'):
+                            result_lines.append(str(flat_res.name) + "\n")
+                            res_names.add(flat_res.name)
+                        else:
+                            result_lines.append(str(flat_res) + "\n")
+                    res_is_no_data_object = not res_names
                     self.sparql_query_result_list = flat_res_list
-                    result = ""
-                    res_is_no_data_object = True
-                for flat_res in flat_res_list:
-                    try:
-                        result = result + str(flat_res.name) + "\n"
-                        self.logger.info("result is a valid node/edge of graph")
-                        res_is_no_data_object = False
-                    except AttributeError:
-                        graph_data = self.data
-                        result = result + str(flat_res) + "\n"
-                        self.logger.info("result is not an object (A-/ T-Box) in graph (different data-type)")
+                    self.sparql_query_result_names = frozenset(res_names)
+                    result = "".join(result_lines)
                 self.sparql_query_result = result
-                if not res_is_no_data_object:
-                    self.filtered_data['nodes'], selection['nodes'] = get_nodes_to_be_shown(self.filtered_data,
-                                                                                            flat_res_list,
-                                                                                            shown_result_level)
+                if res_is_no_data_object:
+                    graph_data = self.filtered_data
+                    self.logger.info("result is not an object (A-/ T-Box) in graph (different data-type)")
+                else:
+                    self.logger.info("result is a valid node/edge of graph")
+                    shown_nodes, selection['nodes'] = self.get_nodes_around_result(self.sparql_query_result_names,
+                                                                                   shown_result_level)
+                    self.show_nodes(shown_nodes)
                     graph_data = self.filtered_data
                 self.add_to_query_history()
                 self.logger.info("valid sparql query successfully evaluated")
             except pyparsing.ParseException:
-                graph_data = self.data
+                graph_data = self.filtered_data
                 result = "Syntax Error in SPARQL Query."
                 self.sparql_query_result = result
+                self.add_to_invalid_sparql_queries(result)
                 self.logger.warning("sparql query passed from user includes a syntax error")
             except Exception:
-                graph_data = self.data
+                graph_data = self.filtered_data
                 result = "An unknown Error occurred! Possible reasons are: " \
                          "\n - Used Prefix is not defined " \
                          "\n - Structural mistake in query"
                 self.sparql_query_result = result
+                self.add_to_invalid_sparql_queries(result)
                 self.logger.warning("sparql query passed from user includes an error")
 
         else:
-            graph_data = self.data
+            graph_data = self.filtered_data
             result = "There is nothing to evaluate."
             self.sparql_query_result = result
             self.logger.warning("sparql query passed from user is empty")
         return graph_data, result, selection
 
-    def _callback_sparql_query_history(self, number_of_shown_queries: int):
-        """ gets the sparql queries to be shown in the sparql query history
+    def update_filtered_data(self, element: str = 'nodes'):
+        """ sets the nodes or edges currently shown to the elements of the complete graph data marked in their mask
 
-        :param number_of_shown_queries: how many queries will be included in the history
-        :type number_of_shown_queries: int
-        :return: the history of sparql queries to be shown
-        :rtype: str
+        :param element: the elements to be updated, either 'nodes' or 'edges'
+         :type element: str
         """
-        sparql_query_history = self.sparql_query_history
-        if self.counter_query_history > number_of_shown_queries:
-            separator = str(self.counter_query_history - (number_of_shown_queries - 1)) + ": "
-            partition = sparql_query_history.partition(separator)
-            shown_sparql_query_history = partition[1] + partition[2]
+        mask = self.masks[element]
+        if mask.all():
+            self.filtered_data[element] = self.data[element]
         else:
-            shown_sparql_query_history = sparql_query_history
-        return shown_sparql_query_history
+            self.filtered_data[element] = self.element_arrays[element][mask].tolist()
+
+    def show_all_data(self):
+        """ marks all nodes and edges of the complete graph data as shown
+        """
+        for element in ('nodes', 'edges'):
+            self.masks[element][:] = True
+            self.update_filtered_data(element)
+
+    def show_default_nodes(self):
+        """ marks all nodes and edges as shown, if not all nodes are to be shown only the T-Boxes are marked
+        """
+        self.show_all_data()
+        if not self.show_all_nodes:
+            self.masks['nodes'][:] = self.get_data_frame('nodes')['T/A'].to_numpy() == 'T'
+            self.update_filtered_data('nodes')
+
+    def show_nodes(self, nodes: list):
+        """ marks only the given nodes as shown
+
+        :param nodes: the nodes to be shown in format of visdcc
+         :type nodes: list
+        """
+        self.masks['nodes'][:] = False
+        self.masks['nodes'][[self.node_positions[node['id']] for node in nodes]] = True
+        self.update_filtered_data('nodes')
+
+    def get_selected_elements(self, selection: dict, element: str = 'nodes'):
+        """ looks up the selected node or edge by its id, a node or edge is only found if it is the only one selected
+
+        :param selection: the selection of the graph in format of visdcc
+         :type selection: dict
+         :param element: the selected elements to look up, either 'nodes' or 'edges'
+         :type element: str
+         :return: list with the selected node or edge, empty if not exactly one known node or edge is selected
+         :rtype: list[dict]
+        """
+        elements_by_id = self.nodes_by_id if element == 'nodes' else self.edges_by_id
+        # the selection set by the main callback holds the selected nodes themselves instead of their ids
+        if len(selection[element]) == 1 and isinstance(selection[element][0], str) \
+                and selection[element][0] in elements_by_id:
+            return [elements_by_id[selection[element][0]]]
+        return []
+
+    def get_graph_patch(self, element: str, keys: list):
+        """ gets the id and the given attributes of the nodes or edges currently shown, to update them in the browser
+
+        :param element: the elements of the patch, either 'nodes' or 'edges'
+         :type element: str
+         :param keys: the attributes of the elements that have changed
+         :type keys: list
+         :return: the ids and the changed attributes of the elements currently shown, as columns
+         :rtype: dict[str, list]
+        """
+        # the columns of the cached DataFrame are kept in sync with the attributes of the nodes/ edges
+        data_frame = self.get_data_frame(element)
+        mask = self.masks[element]
+        return {key: data_frame[key].to_numpy()[mask].tolist() for key in ['id', *keys]}
 
     def _callback_color_nodes(self, color_nodes_value: str):
         """ colors the nodes according to the color_nodes_value
@@ -473,20 +657,16 @@ class SQV:
          :rtype: tuple[dict, dict]
         """
         value_color_mapping = {}
+        nodes_df = self.get_data_frame('nodes')
         # color option is None, revert back all changes
         if color_nodes_value == 'None':
             # revert to default color
-            for node in self.data['nodes']:
-                node['color'] = DEFAULT_COLOR
+            nodes_df['color'] = DEFAULT_COLOR
         else:
-            unique_values = pd.DataFrame(self.data['nodes'])[color_nodes_value].unique()
-            colors = get_distinct_colors(len(unique_values), for_nodes=True)
-            value_color_mapping = {x: y for x, y in zip(unique_values, colors)}
-            for node in self.data['nodes']:
-                node['color'] = value_color_mapping[node[color_nodes_value]]
-        # filter the data currently shown
-        filtered_nodes = [x['id'] for x in self.filtered_data['nodes']]
-        self.filtered_data['nodes'] = [x for x in self.data['nodes'] if x['id'] in filtered_nodes]
+            # the colors are only mapped once per feature
+            nodes_df['color'], value_color_mapping = self.get_feature_colors('nodes', color_nodes_value)
+        # write the color column back to the nodes
+        _project_column(self.data['nodes'], 'color', nodes_df['color'].tolist())
         graph_data = self.filtered_data
         return graph_data, value_color_mapping
 
@@ -505,20 +685,17 @@ class SQV:
             # fetch the scaling value
             minn = self.scaling_vars['node'][size_nodes_value]['min']
             maxx = self.scaling_vars['node'][size_nodes_value]['max']
+        nodes_df = self.get_data_frame('nodes')
         # color option is None, revert back all changes
         if size_nodes_value == 'None' or minn == maxx:
             # revert to default size
-            for node in self.data['nodes']:
-                node['size'] = DEFAULT_NODE_SIZE
+            nodes_df['size'] = DEFAULT_NODE_SIZE
         else:
-            # define the scaling function
-            scale_val = lambda x: 20 * (x - minn) / (maxx - minn)
-            # set size after scaling
-            for node in self.data['nodes']:
-                node['size'] = node['size'] + scale_val(node[size_nodes_value])
-        # filter the data currently shown
-        filtered_nodes = [x['id'] for x in self.filtered_data['nodes']]
-        self.filtered_data['nodes'] = [x for x in self.data['nodes'] if x['id'] in filtered_nodes]
+            # scale all values at once and add them to the default size
+            values = nodes_df[size_nodes_value].to_numpy(dtype=np.float64)
+            nodes_df['size'] = DEFAULT_NODE_SIZE + 20 * (values - minn) / (maxx - minn)
+        # write the size column back to the nodes
+        _project_column(self.data['nodes'], 'size', nodes_df['size'].tolist())
         graph_data = self.filtered_data
         return graph_data
 
@@ -531,20 +708,16 @@ class SQV:
                  :rtype: tuple[dict, dict]
                 """
         value_color_mapping = {}
+        edges_df = self.get_data_frame('edges')
         # color option is None, revert back all changes
         if color_edges_value == 'None':
             # revert to default color
-            for edge in self.data['edges']:
-                edge['color']['color'] = DEFAULT_COLOR
+            colors = [DEFAULT_COLOR] * len(edges_df)
         else:
-            unique_values = pd.DataFrame(self.data['edges'])[color_edges_value].unique()
-            colors = get_distinct_colors(len(unique_values), for_nodes=False)
-            value_color_mapping = {x: y for x, y in zip(unique_values, colors)}
-            for edge in self.data['edges']:
-                edge['color']['color'] = value_color_mapping[edge[color_edges_value]]
-        # filter the data currently shown
-        filtered_edges = [x['id'] for x in self.filtered_data['edges']]
-        self.filtered_data['edges'] = [x for x in self.data['edges'] if x['id'] in filtered_edges]
+            # the colors are only mapped once per feature
+            colors, value_color_mapping = self.get_feature_colors('edges', color_edges_value)
+        # write the colors into the color dicts of the edges, which are shared with the color column of edges_df
+        _project_column(edges_df['color'].tolist(), 'color', colors)
         graph_data = self.filtered_data
         return graph_data, value_color_mapping
 
@@ -562,24 +735,17 @@ class SQV:
         if size_edges_value != 'None':
             minn = self.scaling_vars['edge'][size_edges_value]['min']
             maxx = self.scaling_vars['edge'][size_edges_value]['max']
+        edges_df = self.get_data_frame('edges')
         # if color option is None or minn and maxx is the same, revert back all changes
         if size_edges_value == 'None' or minn == maxx:
             # revert to default size
-            for edge in self.data['edges']:
-                edge['width'] = DEFAULT_EDGE_SIZE
+            edges_df['width'] = DEFAULT_EDGE_SIZE
         else:
-            # define the scaling function
-            scale_val = lambda x: 5 * (x - minn) / (maxx - minn)
-            # set the size after scaling
-            for edge in self.data['edges']:
-                if edge[size_edges_value] == minn:
-                    edge['width'] = DEFAULT_EDGE_SIZE
-                else:
-                    edge['width'] = scale_val(edge[size_edges_value])
-                # edge['width'] = edge[size_edges_value]
-        # filter the data currently shown
-        filtered_edges = [x['id'] for x in self.filtered_data['edges']]
-        self.filtered_data['edges'] = [x for x in self.data['edges'] if x['id'] in filtered_edges]
+            # scale all values at once, edges with the minimal value get the default size
+            values = edges_df[size_edges_value].to_numpy(dtype=np.float64)
+            edges_df['width'] = np.where(values == minn, DEFAULT_EDGE_SIZE, 5 * (values - minn) / (maxx - minn))
+        # write the width column back to the edges, the cached DataFrame stays valid
+        _project_column(self.data['edges'], 'width', edges_df['width'].tolist())
         graph_data = self.filtered_data
         return graph_data
 
@@ -592,70 +758,73 @@ class SQV:
 
         # Give all is_a edges a circle as arrowhead
         self.edit_edge_appearance(directed=directed)
-        # Get list of categorical features from nodes
-        cat_node_features = get_categorical_features(pd.DataFrame(self.data['nodes']),
-                                                     20, ['shape', 'label', 'id', 'title', 'color'])
-        # Define label and value for each categorical feature
-        options = [{'label': opt, 'value': opt} for opt in cat_node_features]
-        # If options has more then one categorical feature, the callback function for nodes-coloring is executed once,
-        # to set the first option as default value
-        if len(options) > 1:
-            self.data, self.node_value_color_mapping = self._callback_color_nodes(options[1].get('value'))
+        # Build the DataFrames of nodes and edges once and get all categorical and numerical features from them
+        nodes_df = self.get_data_frame('nodes')
+        edges_df = self.get_data_frame('edges')
+        cat_node_features = get_categorical_features(nodes_df, 20, ['shape', 'label', 'id', 'title', 'color'])
+        cat_edge_features = get_categorical_features(edges_df, 20, ['color', 'from', 'to', 'id', 'arrows'])
+        num_node_features = get_numerical_features(nodes_df)
+        num_edge_features = get_numerical_features(edges_df)
+        # the features are reused for the dropdowns of the layout
+        self.features = {'cat_node': cat_node_features, 'cat_edge': cat_edge_features,
+                         'num_node': num_node_features, 'num_edge': num_edge_features}
+        # If there is more then one feature, the respective callback function is executed once,
+        # to set the first feature as default value
+        if len(cat_node_features) > 1:
+            _, self.node_value_color_mapping = self._callback_color_nodes(cat_node_features[1])
             self.logger.info("Nodes were initially colored")
-        # Get list of categorical features from edges
-        cat_edge_features = get_categorical_features(pd.DataFrame(self.data['edges']).drop(
-            columns=['color', 'from', 'to', 'id', 'arrows']), 20, ['color', 'from', 'to', 'id'])
-        # Define label and value for each categorical feature
-        options = [{'label': opt, 'value': opt} for opt in cat_edge_features]
-        # If options has mor then one categorical feature, the callback function for edge-coloring is executed once,
-        # to set the first option as default value
-        if len(options) > 1:
-            self.data, self.edge_value_color_mapping = self._callback_color_edges(options[1].get('value'))
+        if len(cat_edge_features) > 1:
+            _, self.edge_value_color_mapping = self._callback_color_edges(cat_edge_features[1])
             self.logger.info("Edges were initially colored")
-        # Get list of numerical features from nodes
-        num_node_features = get_numerical_features(pd.DataFrame(self.data['nodes']))
-        # Define label and value for each numerical feature
-        options = [{'label': opt, 'value': opt} for opt in num_node_features]
-        # If options has mor then one numerical feature, the callback function for nodes-sizing is executed once,
-        # to set the first option as default value
-        if len(options) > 1:
-            self.data = self._callback_size_nodes(options[1].get('value'))
+        if len(num_node_features) > 1:
+            self._callback_size_nodes(num_node_features[1])
             self.logger.info("Nodes were initially sized")
-        # Get list of numerical features from edges
-        num_edge_features = get_numerical_features(pd.DataFrame(self.data['edges']))
-        # Define label and value for each numerical feature
-        options = [{'label': opt, 'value': opt} for opt in num_edge_features]
-        # If options has mor then one numerical feature, the callback function for edge-sizing is executed once,
-        # to set the first option as default value
-        if len(options) > 1:
-            self.data = self._callback_size_edges(options[1].get('value'))
+        if len(num_edge_features) > 1:
+            self._callback_size_edges(num_edge_features[1])
             self.logger.info("Edges were initially sized")
 
-    def create(self, directed: bool = False, vis_opts: dict = None):
+    def create(self, directed: bool = False, vis_opts: dict = None, max_visible_nodes: int = 2000):
         """ creates the SPARQl-Query-Viz app and returns it
 
         :param directed: indicates whether the graph is directed
          :type directed: bool
          :param vis_opts: additional visualization options for the visdcc-graph
          :type vis_opts: dict
+         :param max_visible_nodes: if the graph has more nodes, only the T-Boxes are shown at the start until the user
+          shows all nodes, None to always show all nodes
+         :type max_visible_nodes: int
          :return: the SPARQl-Query-Viz app
          :rtype dash.Dash
         """
+        # the app is only created again if the arguments have changed since the last call, as creating the app also
+        # changes the appearance of the edges in self.data and registers all callbacks again
+        app_key = (directed, repr(vis_opts), max_visible_nodes)
+        if self.app is not None and app_key == self.app_key:
+            return self.app
         # create the app
         app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], title='SPARQL-Query-Viz')
 
         # get color_mapping and size_mapping once at the start
         self.forced_callback_execution_at_beginning(directed=directed)
 
+        # large graphs only show the T-Boxes at the start
+        self.show_all_nodes = max_visible_nodes is None or len(self.data['nodes']) <= max_visible_nodes
+        self.show_default_nodes()
+        # the main callback is not called at the start, so the initial values of its inputs are taken from the layout
+        self.last_input_values = {'result-level-slider': DEFAULT_RESULT_LEVEL,
+                                  'show-all-nodes': ['show_all'] if self.show_all_nodes else []}
+
         # define layout
-        app.layout = get_app_layout(self.data, self.onto, color_legends=get_color_popover_legend_children(),
-                                    directed=directed, vis_opts=vis_opts, abox=self.abox)
+        app.layout = get_app_layout(self.filtered_data, self.onto, color_legends=get_color_popover_legend_children(),
+                                    directed=directed, vis_opts=vis_opts, abox=self.abox, features=self.features,
+                                    all_nodes_shown=self.show_all_nodes)
 
         # create callback to freeze/ unfreeze simulation
         @app.callback(
             Output("graph", "options"),
             Input("freeze-physics", "n_clicks"),
             [State("graph", "options")],
+            prevent_initial_call=True,
         )
         def toggle_filter_collapse(n_show, options):
             if n_show and options['physics'] == {'enabled': False}:
@@ -669,6 +838,7 @@ class SQV:
             Output("color-legend-popup", "is_open"),
             [Input("color-legend-toggle", "n_clicks")],
             [State("color-legend-popup", "is_open")],
+            prevent_initial_call=True,
         )
         def toggle_popover(n, is_open):
             if n:
@@ -684,6 +854,7 @@ class SQV:
             Output("info-sparql-popup", "is_open"),
             [Input("info-sparql-query-button", "n_clicks")],
             [State("info-sparql-popup", "is_open")],
+            prevent_initial_call=True,
         )
         def toggle_popover(n, is_open):
             if n:
@@ -722,6 +893,22 @@ class SQV:
                     return True
             return is_open
 
+        # create callback to fill the dropdowns to compose sparql queries, when the SPARQL QUERY section is opened for
+        # the first time
+        @app.callback(
+            [Output('sparql-keywords-dropdown', 'options'),
+             Output('sparql-variables-dropdown', 'options'),
+             Output('sparql-syntax-dropdown', 'options')],
+            [Input("filter-show-toggle", "is_open")],
+            [State('sparql-keywords-dropdown', 'options')],
+            prevent_initial_call=True,
+        )
+        def load_sparql_dropdown_options(is_open, keyword_options):
+            if not is_open or keyword_options:
+                raise PreventUpdate
+            self.logger.info("options of the sparql dropdowns were loaded")
+            return [SPARQL_KEYWORD_OPTIONS, SPARQL_VARIABLE_OPTIONS, SPARQL_SYNTAX_OPTIONS]
+
         # create callback to toggle hide/show sections - SPARQL RESULT section
         @app.callback(
             Output("result-show-toggle", "is_open"),
@@ -751,6 +938,7 @@ class SQV:
             Output("history-show-toggle", "is_open"),
             [Input("history-show-toggle-button", "n_clicks")],
             [State("history-show-toggle", "is_open")],
+            prevent_initial_call=True,
         )
         def toggle_filter_collapse(n_show, is_open):
             if n_show:
@@ -868,6 +1056,7 @@ class SQV:
             Output("color-show-toggle", "is_open"),
             [Input("color-show-toggle-button", "n_clicks")],
             [State("color-show-toggle", "is_open")],
+            prevent_initial_call=True,
         )
         def toggle_filter_collapse(n, is_open):
             if n:
@@ -883,6 +1072,7 @@ class SQV:
             Output("size-show-toggle", "is_open"),
             [Input("size-show-toggle-button", "n_clicks")],
             [State("size-show-toggle", "is_open")],
+            prevent_initial_call=True,
         )
         def toggle_filter_collapse(n, is_open):
             if n:
@@ -898,6 +1088,7 @@ class SQV:
             Output("template-show-toggle", "is_open"),
             [Input("template-show-toggle-button", "n_clicks")],
             [State("template-show-toggle", "is_open")],
+            prevent_initial_call=True,
         )
         def toggle_template_collapse(n, is_open):
             if n:
@@ -913,6 +1104,7 @@ class SQV:
             Output("library-show-toggle", "is_open"),
             [Input("library-show-toggle-button", "n_clicks")],
             [State("library-show-toggle", "is_open")],
+            prevent_initial_call=True,
         )
         def toggle_library_collapse(n, is_open):
             if n:
@@ -950,14 +1142,13 @@ class SQV:
                     if on_select:
                         return is_open
                     elif len(selection['nodes']) > 0:
-                        for node in self.data['nodes']:
-                            if [node['id']] == selection['nodes']:
-                                if node['T/A'] == 'A':
-                                    self.logger.info("A-Box Data Property section was shown, triggered by user")
-                                    return True
-                                else:
-                                    self.logger.info("A-Box Data Property section was hidden, triggered by user")
-                                    return False
+                        for node in self.get_selected_elements(selection, 'nodes'):
+                            if node['T/A'] == 'A':
+                                self.logger.info("A-Box Data Property section was shown, triggered by user")
+                                return True
+                            else:
+                                self.logger.info("A-Box Data Property section was hidden, triggered by user")
+                                return False
                     elif (selection == {'nodes': [], 'edges': []}) or \
                             (len(selection['nodes']) == 0 and len(selection['edges']) > 0):
                         self.logger.info("A-Box Data Property section was hidden, triggered by user")
@@ -1005,23 +1196,13 @@ class SQV:
         def show_dp_from_selected_node(x):
             s_node = ''
             if len(x['nodes']) > 0:
-                for node in self.data['nodes']:
-                    if [node['id']] == x['nodes']:
-                        if node['T/A'] == 'T':
-                            return s_node
-                        s_node = [html.Div(x['nodes'] + [': '])]
-                        if node['title'] == '':
-                            return s_node + [html.Div(['No Data-Properties for this A-Box'])]
-                        separator = ',\n '
-                        partition = node['title'].partition(separator)
-                        if separator in node['title']:
-                            s_node = s_node + [html.Div([partition[0]])]
-                            while separator in partition[2]:
-                                partition = partition[2].partition(separator)
-                                s_node = s_node + [html.Div([partition[0]])]
-                            s_node = s_node + [html.Div([partition[2]])]
-                        else:
-                            s_node = s_node + [html.Div([node['title']])]
+                for node in self.get_selected_elements(x, 'nodes'):
+                    if node['T/A'] == 'T':
+                        return s_node
+                    s_node = [html.Div(x['nodes'] + [': '])]
+                    if node['title'] == '':
+                        return s_node + [html.Div(['No Data-Properties for this A-Box'])]
+                    s_node = s_node + [html.Div([data_property]) for data_property in node['title'].split(',\n ')]
             return s_node
 
         # create callback to display label of selected edge
@@ -1031,108 +1212,177 @@ class SQV:
         def show_label_from_selected_edge(x):
             s_edge = ''
             if len(x['edges']) > 0:
-                for edge in self.data['edges']:
-                    if [edge['id']] == x['edges']:
-                        separator = ',\n '
-                        partition_id = edge['id'].partition(separator)
-                        partition_label = edge['label'].partition(separator)
-                        if (separator in edge['id']) and (separator in edge['label']):
-                            s_edge = [html.Div([partition_label[0]] + [': '])]
-                            s_edge = s_edge + [html.Div([partition_id[0]])]
-                            while (separator in partition_id[2]) and (separator in partition_label[2]):
-                                partition_id = partition_id[2].partition(separator)
-                                partition_label = partition_label[2].partition(separator)
-                                s_edge = s_edge + [html.Div([partition_label[0]] + [': '])]
-                                s_edge = s_edge + [html.Div([partition_id[0]])]
-                            s_edge = s_edge + [html.Div([partition_label[2]] + [': '])]
-                            s_edge = s_edge + [html.Div([partition_id[2]])]
-                        else:
-                            s_edge = [html.Div([edge['label']] + [': '])]
-                            s_edge = s_edge + [html.Div([edge['id']])]
+                for edge in self.get_selected_elements(x, 'edges'):
+                    separator = ',\n '
+                    id_parts = edge['id'].split(separator)
+                    label_parts = edge['label'].split(separator)
+                    # if id or label has more parts, its remaining parts are shown together in the last pair
+                    n = min(len(id_parts), len(label_parts))
+                    id_parts[n - 1:] = [separator.join(id_parts[n - 1:])]
+                    label_parts[n - 1:] = [separator.join(label_parts[n - 1:])]
+                    s_edge = [div for label_part, id_part in zip(label_parts, id_parts)
+                              for div in (html.Div([label_part] + [': ']), html.Div([id_part]))]
             return s_edge
 
+        # create callback to evaluate the sparql query, the result is the only output so the loading spinner of the
+        # result is only shown while a query is evaluated
+        @app.callback(
+            Output('sparql-result-store', 'data'),
+            [Input('evaluate_query_button', 'n_clicks')],
+            [State('result-level-slider', 'value')],
+            prevent_initial_call=True,
+        )
+        def evaluate_sparql_query(n_evaluate, shown_result_level):
+            if not n_evaluate:
+                raise PreventUpdate
+            _, result, self.sparql_query_selection = self._callback_filter_nodes(self.filtered_data,
+                                                                                 shown_result_level)
+            return result
+
         # create the main callbacks
         @app.callback(
-            [Output('graph', 'data'),
-             Output('color-legend-popup', 'children'),
-             Output('textarea-result-output', 'children'),
-             Output('sparql_query_history', 'children'),
+            [Output('graph-delta', 'data'),
              Output('graph', 'selection')],
-            [Input('search_graph', 'value'),
-             Input('color_nodes', 'value'),
+            [Input('color_nodes', 'value'),
              Input('color_edges', 'value'),
              Input('size_nodes', 'value'),
              Input('size_edges', 'value'),
-             Input('evaluate_query_button', 'n_clicks'),
-             Input('clear-query-history-button', 'n_clicks'),
-             Input('query-history-length-slider', 'value'),
-             Input("color-legend-toggle", "n_clicks"),
-             Input('result-level-slider', 'value'), ],
-            [State('graph', 'data')]
+             Input('sparql-result-store', 'data'),
+             Input('result-level-slider', 'value'),
+             Input('show-all-nodes', 'value'), ],
+            # the graph and the result output already hold their initial content from the layout
+            prevent_initial_call=True,
         )
-        def setting_pane_callback(search_text, color_nodes_value, color_edges_value,
-                                  size_nodes_value, size_edges_value, n_evaluate, n_clear, query_history_length,
-                                  n_legend, shown_result_level, graph_data):
+        def setting_pane_callback(color_nodes_value, color_edges_value,
+                                  size_nodes_value, size_edges_value, sparql_query_result, shown_result_level,
+                                  show_all_nodes_value):
             # fetch the id of option which triggered
             ctx = dash.callback_context
-            flat_res_list_children = self.sparql_query_result
-            sparql_query_history_children = []
+            # only the changes of the graph data are sent to the browser, the graph data is unchanged by default
+            graph_delta = dash.no_update
             selection = {'nodes': [], 'edges': []}
-            # if its the first call
-            if not ctx.triggered:
-                self.logger.info("no trigger by user")
-                return [self.data, get_color_popover_legend_children(),
-                        flat_res_list_children, sparql_query_history_children, selection]
-            else:
-                # find the id of the option which was triggered
-                input_id = ctx.triggered[0]['prop_id'].split('.')[0]
-                # perform operation in case of search graph option
-                if input_id == "search_graph":
-                    graph_data = _callback_search_graph(graph_data, search_text)
-                    self.logger.info("shown graph data filtered, triggered by user")
-                # In case filter nodes was triggered
-                elif input_id == 'evaluate_query_button' and n_evaluate:
-                    graph_data, flat_res_list_children, selection = self._callback_filter_nodes(graph_data,
-                                                                                                shown_result_level)
-                elif input_id == 'result-level-slider':
-                    graph_data['nodes'], selection['nodes'] = get_nodes_to_be_shown(self.data,
-                                                                                    self.sparql_query_result_list,
-                                                                                    shown_result_level)
-                if input_id == "clear-query-history-button" and n_clear:
-                    self.counter_query_history = 0
-                    self.sparql_query_history = ""
-                    self.logger.info("query history was cleared, triggered by user")
-                # If color node text is provided
-                if input_id == 'color_nodes':
-                    graph_data, self.node_value_color_mapping = self._callback_color_nodes(color_nodes_value)
-                    self.logger.info("Nodes were recolored, triggered by user")
-                # If color edge text is provided
-                if input_id == 'color_edges':
-                    graph_data, self.edge_value_color_mapping = self._callback_color_edges(color_edges_value)
-                    self.logger.info("Edges were recolored, triggered by user")
-                # If size node text is provided
-                if input_id == 'size_nodes':
-                    graph_data = self._callback_size_nodes(size_nodes_value)
-                    self.logger.info("Nodes were resized, triggered by user")
-                # If size edge text is provided
-                if input_id == 'size_edges':
-                    graph_data = self._callback_size_edges(size_edges_value)
-                    self.logger.info("Edges were resized, triggered by user")
-            # create the color legend children
-            color_popover_legend_children = get_color_popover_legend_children(
-                self.node_value_color_mapping, self.edge_value_color_mapping)
-            self.logger.info("color legend was updated, triggered by user")
-            # update the sparql query history
-            sparql_query_history_children = self._callback_sparql_query_history(query_history_length)
-            self.logger.info("query history is shown with a length of %i", query_history_length)
+            input_values = {'color_nodes': color_nodes_value,
+                            'color_edges': color_edges_value,
+                            'size_nodes': size_nodes_value,
+                            'size_edges': size_edges_value,
+                            'result-level-slider': shown_result_level,
+                            'show-all-nodes': show_all_nodes_value}
+            # find the id of the option which was triggered
+            input_id = ctx.triggered[0]['prop_id'].split('.')[0]
+            # skip the callback if the value of the triggering input has not changed
+            if input_id in input_values:
+                if input_id in self.last_input_values \
+                        and self.last_input_values[input_id] == input_values[input_id]:
+                    self.logger.info("value of %s has not changed, callback is skipped", input_id)
+                    raise PreventUpdate
+                self.last_input_values[input_id] = input_values[input_id]
+            # In case filter nodes was triggered
+            if input_id == 'sparql-result-store':
+                # the sparql query was evaluated, only the nodes are filtered, the edges in the browser are already
+                # the edges of self.data
+                graph_delta = {'nodes': self.filtered_data['nodes']}
+                selection = self.sparql_query_selection
+            elif input_id == 'result-level-slider':
+                shown_nodes, selection['nodes'] = self.get_nodes_around_result(self.sparql_query_result_names,
+                                                                               shown_result_level)
+                self.show_nodes(shown_nodes)
+                graph_delta = {'nodes': self.filtered_data['nodes']}
+            elif input_id == 'show-all-nodes':
+                self.show_all_nodes = 'show_all' in show_all_nodes_value
+                self.show_default_nodes()
+                graph_delta = {'nodes': self.filtered_data['nodes']}
+                self.logger.info("all nodes are shown: %s, triggered by user", self.show_all_nodes)
+            # If color node text is provided
+            if input_id == 'color_nodes':
+                _, self.node_value_color_mapping = self._callback_color_nodes(color_nodes_value)
+                graph_delta = {'nodes_patch': self.get_graph_patch('nodes', ['color'])}
+                self.logger.info("Nodes were recolored, triggered by user")
+            # If color edge text is provided
+            if input_id == 'color_edges':
+                _, self.edge_value_color_mapping = self._callback_color_edges(color_edges_value)
+                graph_delta = {'edges_patch': self.get_graph_patch('edges', ['color'])}
+                self.logger.info("Edges were recolored, triggered by user")
+            # If size node text is provided
+            if input_id == 'size_nodes':
+                self._callback_size_nodes(size_nodes_value)
+                graph_delta = {'nodes_patch': self.get_graph_patch('nodes', ['size'])}
+                self.logger.info("Nodes were resized, triggered by user")
+            # If size edge text is provided
+            if input_id == 'size_edges':
+                self._callback_size_edges(size_edges_value)
+                graph_delta = {'edges_patch': self.get_graph_patch('edges', ['width'])}
+                self.logger.info("Edges were resized, triggered by user")
             # finally return the modified data
-            return [graph_data, color_popover_legend_children, flat_res_list_children,
-                    sparql_query_history_children, selection]
+            return [graph_delta, selection]
+
+        # create callback to update the color legend after the graph was changed
+        @app.callback(
+            Output('color-legend-popup', 'children'),
+            [Input('graph-delta', 'data')]
+        )
+        def update_color_legend(graph_delta):
+            ctx = dash.callback_context
+            # the legend is only rebuilt, if the content of the color mappings has changed since it was last built
+            legend_key = (tuple(self.node_value_color_mapping.items()), tuple(self.edge_value_color_mapping.items()))
+            if ctx.triggered and legend_key == self.shown_legend_key:
+                raise PreventUpdate
+            self.shown_legend_key = legend_key
+            self.logger.info("color legend was updated")
+            return get_color_popover_legend_children(self.node_value_color_mapping, self.edge_value_color_mapping)
+
+        # create callback to update the sparql query history after a sparql query was evaluated
+        @app.callback(
+            Output('sparql-query-history-store', 'data'),
+            [Input('sparql-result-store', 'data'),
+             Input('clear-query-history-button', 'n_clicks')]
+        )
+        def update_sparql_query_history(result, n_clear):
+            ctx = dash.callback_context
+            if ctx.triggered and ctx.triggered[0]['prop_id'] == 'clear-query-history-button.n_clicks' and n_clear:
+                self.counter_query_history = 0
+                self.sparql_query_history.clear()
+                self.logger.info("query history was cleared, triggered by user")
+            return list(self.sparql_query_history)
+
+        # show the pages of the sparql result in the browser (see assets/sqv_graph.js), turning the pages does not need
+        # the server
+        app.clientside_callback(
+            ClientsideFunction(namespace='sqv', function_name='show_sparql_query_result'),
+            [Output('textarea-result-output', 'children'),
+             Output('result-page', 'value'),
+             Output('result-page', 'max'),
+             Output('result-page-count', 'children')],
+            [Input('sparql-result-store', 'data'),
+             Input('result-page', 'value')]
+        )
 
+        # show the last queries of the history in the browser (see assets/sqv_graph.js), changing the length of the
+        # shown history does not need the server
+        app.clientside_callback(
+            ClientsideFunction(namespace='sqv', function_name='show_sparql_query_history'),
+            Output('sparql_query_history', 'children'),
+            [Input('sparql-query-history-store', 'data'),
+             Input('query-history-length-slider', 'value')]
+        )
+
+        # merge the changes of the graph data into the graph and search the graph in the browser (see
+        # assets/sqv_graph.js), the graph data is already there, so the search does not need the server
+        app.clientside_callback(
+            ClientsideFunction(namespace='sqv', function_name='update_graph'),
+            Output('graph', 'data'),
+            [Input('graph-delta', 'data'),
+             Input('search_graph', 'value')],
+            State('graph', 'data')
+        )
+
+        self.app = app
+        self.app_key = app_key
         return app
 
     def plot(self, debug: bool = False, host: str = "127.0.0.1", port: int = 8050,
-             directed: bool = True, vis_opts: dict = None):
+             directed: bool = True, vis_opts: dict = None, max_visible_nodes: int = 2000,
+             production: bool = False, threads: int = 8, dev_tools_ui: bool = None,
+             dev_tools_props_check: bool = False, dev_tools_hot_reload: bool = None):
         """Plot the Jaal by first creating the app and then hosting it on default server
 
 
@@ -1146,8 +1396,29 @@ class SQV:
         :type directed: bool
         :param vis_opts: the visual options to be passed to the dash server
         :type directed: dict
+        :param max_visible_nodes: if the graph has more nodes, only the T-Boxes are shown at the start
+        :type max_visible_nodes: int
+        :param production: serve the app with the waitress WSGI server instead of the Flask development server,
+         requires the optional dependency waitress (pip install sparql_query_viz[production])
+        :type production: bool
+        :param threads: number of threads of the waitress server, the app runs in a single process as the state of
+         the graph is held by this SQV instance
+        :type threads: int
+        :param dev_tools_ui: show the dev tools UI (including the callback graph) in debug mode, defaults to debug
+        :type dev_tools_ui: bool
+        :param dev_tools_props_check: validate the props of the components after every callback in debug mode, slows
+         down the app for large graphs
+        :type dev_tools_props_check: bool
+        :param dev_tools_hot_reload: reload the app when its source files change in debug mode, defaults to debug
+        :type dev_tools_hot_reload: bool
         """
         # call the create_graph function
-        app = self.create(directed=directed, vis_opts=vis_opts)
+        app = self.create(directed=directed, vis_opts=vis_opts, max_visible_nodes=max_visible_nodes)
         # run the server
-        app.run_server(debug=debug, host=host, port=port)
+        if production:
+            from waitress import serve
+            self.logger.info("serving the app with waitress on %s:%s", host, port)
+            serve(app.server, host=host, port=port, threads=threads)
+        else:
+            app.run_server(debug=debug, host=host, port=port, dev_tools_ui=dev_tools_ui,
+                           dev_tools_props_check=dev_tools_props_check, dev_tools_hot_reload=dev_tools_hot_reload)
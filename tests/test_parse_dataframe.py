@@ -0,0 +1,32 @@
+import unittest
+
+import pandas as pd
+
+from sparql_query_viz.datasets.parse_dataframe import parse_dataframe
+
+
+class DropDuplicatedEdgesTest(unittest.TestCase):
+
+    def test_duplicated_edges_are_dropped(self):
+        edge_df = pd.DataFrame({'from': ['a', 'a', 'a', 'b'], 'to': ['b', 'b', 'b', 'a'],
+                                'label': ['is_a', 'is_a', 'has', 'is_a'], 'weight': [1, 2, 3, 4]})
+        data, _ = parse_dataframe(edge_df)
+        edges = [(edge['from'], edge['to'], edge['label'], edge['weight']) for edge in data['edges']]
+        # the first of the duplicated edges is kept
+        self.assertEqual(edges, [('a', 'b', 'is_a', 1), ('a', 'b', 'has', 3), ('b', 'a', 'is_a', 4)])
+
+    def test_edges_differing_only_in_other_columns_are_duplicates(self):
+        edge_df = pd.DataFrame({'from': ['a', 'a'], 'to': ['b', 'b'], 'label': ['is_a', 'is_a'],
+                                'id': ['first', 'second'], 'weight': [1, 2]})
+        data, _ = parse_dataframe(edge_df)
+        self.assertEqual([edge['id'] for edge in data['edges']], ['first'])
+
+    def test_edges_without_label_are_compared_by_their_nodes(self):
+        edge_df = pd.DataFrame({'from': ['a', 'a', 'b'], 'to': ['b', 'b', 'a'], 'weight': [1, 2, 3]})
+        data, _ = parse_dataframe(edge_df)
+        self.assertEqual([(edge['from'], edge['to'], edge['weight']) for edge in data['edges']],
+                         [('a', 'b', 1), ('b', 'a', 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
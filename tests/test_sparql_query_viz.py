@@ -0,0 +1,143 @@
+import collections
+import json
+import unittest
+
+from sparql_query_viz import SQV
+from sparql_query_viz.layout import DEFAULT_NODE_SIZE
+from sparql_query_viz.sparql_query_viz import MAX_INVALID_SPARQL_QUERIES, MAX_QUERY_HISTORY_LENGTH
+
+
+class GetSelectedElementsTest(unittest.TestCase):
+
+    def setUp(self):
+        # the lookup only needs the nodes and edges by id, so the ontology is not loaded
+        self.sqv = SQV.__new__(SQV)
+        self.node = {'id': 'pizza', 'T/A': 'T', 'title': ''}
+        self.edge = {'id': 'margherita is_a pizza', 'label': 'is_a'}
+        self.sqv.nodes_by_id = {self.node['id']: self.node}
+        self.sqv.edges_by_id = {self.edge['id']: self.edge}
+
+    def test_selected_ids_are_looked_up(self):
+        selection = {'nodes': ['pizza'], 'edges': ['margherita is_a pizza']}
+        self.assertEqual(self.sqv.get_selected_elements(selection, 'nodes'), [self.node])
+        self.assertEqual(self.sqv.get_selected_elements(selection, 'edges'), [self.edge])
+
+    def test_selected_node_dict_is_ignored(self):
+        # the main callback selects the result nodes themselves
+        selection = {'nodes': [dict(self.node)], 'edges': []}
+        self.assertEqual(self.sqv.get_selected_elements(selection, 'nodes'), [])
+
+    def test_unknown_or_multiple_selection_is_ignored(self):
+        self.assertEqual(self.sqv.get_selected_elements({'nodes': ['unknown'], 'edges': []}, 'nodes'), [])
+        self.assertEqual(self.sqv.get_selected_elements({'nodes': ['pizza', 'pizza'], 'edges': []}, 'nodes'), [])
+
+
+class SizeNodesTest(unittest.TestCase):
+
+    def setUp(self):
+        # sizing only needs the nodes, their scaling variables and the DataFrame cache
+        self.sqv = SQV.__new__(SQV)
+        self.sqv.data = {'nodes': [{'id': 'a', 'weight': 0}, {'id': 'b', 'weight': 5}, {'id': 'c', 'weight': 10}],
+                         'edges': []}
+        self.sqv.filtered_data = self.sqv.data
+        self.sqv.scaling_vars = {'node': {'weight': {'min': 0, 'max': 10}}, 'edge': {}}
+        self.sqv.data_version = 0
+        self.sqv.data_frames = {}
+
+    def sizes(self):
+        return [node['size'] for node in self.sqv.data['nodes']]
+
+    def test_sizes_are_scaled_from_the_feature(self):
+        self.sqv._callback_size_nodes('weight')
+        self.assertEqual(self.sizes(), [DEFAULT_NODE_SIZE, DEFAULT_NODE_SIZE + 10, DEFAULT_NODE_SIZE + 20])
+
+    def test_repeated_resize_does_not_compound(self):
+        self.sqv._callback_size_nodes('weight')
+        first_sizes = self.sizes()
+        self.sqv._callback_size_nodes('weight')
+        self.sqv._callback_size_nodes('weight')
+        self.assertEqual(self.sizes(), first_sizes)
+
+    def test_none_reverts_to_default_size(self):
+        self.sqv._callback_size_nodes('weight')
+        self.sqv._callback_size_nodes('None')
+        self.assertEqual(self.sizes(), [DEFAULT_NODE_SIZE] * 3)
+
+
+class QueryHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sqv = SQV.__new__(SQV)
+        self.sqv.sparql_query_history = collections.deque(maxlen=MAX_QUERY_HISTORY_LENGTH)
+        self.sqv.counter_query_history = 0
+
+    def add_queries(self, count: int):
+        for number in range(count):
+            self.sqv.sparql_query = 'SELECT ' + str(number)
+            self.sqv.add_to_query_history()
+
+    def test_queries_are_numbered(self):
+        self.add_queries(2)
+        self.assertEqual(list(self.sqv.sparql_query_history), ['1: SELECT 0\n', '2: SELECT 1\n'])
+
+    def test_history_keeps_the_last_queries(self):
+        self.add_queries(MAX_QUERY_HISTORY_LENGTH + 3)
+        self.assertEqual(len(self.sqv.sparql_query_history), MAX_QUERY_HISTORY_LENGTH)
+        self.assertEqual(self.sqv.sparql_query_history[0], '4: SELECT 3\n')
+        self.assertEqual(self.sqv.sparql_query_history[-1],
+                         str(MAX_QUERY_HISTORY_LENGTH + 3) + ': SELECT ' + str(MAX_QUERY_HISTORY_LENGTH + 2) + '\n')
+
+
+class InvalidSparqlQueriesTest(unittest.TestCase):
+
+    def test_oldest_invalid_queries_are_forgotten(self):
+        sqv = SQV.__new__(SQV)
+        sqv.invalid_sparql_queries = collections.OrderedDict()
+        for number in range(MAX_INVALID_SPARQL_QUERIES + 2):
+            sqv.sparql_query = 'SELECT ' + str(number)
+            sqv.add_to_invalid_sparql_queries('Syntax Error in SPARQL Query.')
+        self.assertEqual(len(sqv.invalid_sparql_queries), MAX_INVALID_SPARQL_QUERIES)
+        self.assertNotIn('SELECT 0', sqv.invalid_sparql_queries)
+        self.assertNotIn('SELECT 1', sqv.invalid_sparql_queries)
+        self.assertIn('SELECT ' + str(MAX_INVALID_SPARQL_QUERIES + 1), sqv.invalid_sparql_queries)
+
+
+class ShowAllNodesTest(unittest.TestCase):
+
+    def setUp(self):
+        # the pizza ontology has more nodes than are visible at the start
+        self.sqv = SQV()
+        self.app = self.sqv.create(max_visible_nodes=10)
+        self.client = self.app.server.test_client()
+
+    def update_main_callback(self, input_id: str, value):
+        # posts the changed value of the input to the main callback like the browser does
+        dependencies = json.loads(self.client.get('/_dash-dependencies').data)
+        dependency = next(dependency for dependency in dependencies if '..graph-delta.data' in dependency['output'])
+        outputs = [output.rsplit('.', 1) for output in dependency['output'].strip('.').split('...')]
+        body = {'output': dependency['output'],
+                'outputs': [{'id': output_id, 'property': output_property} for output_id, output_property in outputs],
+                'inputs': [dict(spec, value=value if spec['id'] == input_id else None)
+                           for spec in dependency['inputs']],
+                'state': [dict(spec, value=None) for spec in dependency['state']],
+                'changedPropIds': [input_id + '.value']}
+        response = self.client.post('/_dash-update-component', json=body)
+        return json.loads(response.data)['response']
+
+    def test_large_graph_starts_with_the_tboxes_only(self):
+        self.assertFalse(self.sqv.show_all_nodes)
+        self.assertEqual(self.app.layout['show-all-nodes'].value, [])
+        shown_nodes = self.sqv.filtered_data['nodes']
+        self.assertLess(len(shown_nodes), len(self.sqv.data['nodes']))
+        self.assertTrue(all(node['T/A'] == 'T' for node in shown_nodes))
+
+    def test_showing_all_nodes_restores_the_aboxes(self):
+        response = self.update_main_callback('show-all-nodes', ['show_all'])
+        self.assertTrue(self.sqv.show_all_nodes)
+        self.assertEqual(len(response['graph-delta']['data']['nodes']), len(self.sqv.data['nodes']))
+        response = self.update_main_callback('show-all-nodes', [])
+        self.assertTrue(all(node['T/A'] == 'T' for node in response['graph-delta']['data']['nodes']))
+
+
+if __name__ == '__main__':
+    unittest.main()